@@ -1,81 +1,237 @@
 import heapq
-import math
+from array import array
+
+from BatchSolve import solve_many
+from Heuristics import get_heuristic, flat_heuristic, heuristic_table
+from SearchEvents import PUSH, EXPAND, STALE, GOAL, run_search
+from SearchStats import SearchStats
 
 class AStarSearch:
-    def __init__(self, maze, heuristic_type="manhattan"):
-        self.maze = maze.grid
+    def __init__(self, maze, heuristic_type="manhattan", bidirectional=False, precompute=False, graph=False):
+        self.maze_obj = maze
         self.n = maze.n
         # Store the chosen heuristic type (default is manhattan)
         self.heuristic_type = heuristic_type.lower()
+        # Resolved once here so the search loop never compares strings
+        self._heuristic = get_heuristic(self.heuristic_type)
+        # Build a table of h for every cell (one NumPy pass per goal) instead of
+        # computing h per push; costs n*n numbers of memory
+        self.precompute = precompute
+        # (goal, maze.version, lookup) of the last table, reused by later queries to that goal
+        self._table = None
+        # Search the junction graph (corridors collapsed) instead of single cells
+        self.graph = graph
+        # Search from both ends at once (see _solve_bidirectional)
+        self.bidirectional = bidirectional
 
     def heuristic(self, a, b):
         """
         Calculates distance based on the selected heuristic type.
         """
-        x1, y1 = a
-        x2, y2 = b
-
-        if self.heuristic_type == "manhattan":
-            # Best for 4-direction grids (Up, Down, Left, Right)
-            return abs(x1 - x2) + abs(y1 - y2)
-        
-        elif self.heuristic_type == "euclidean":
-            # Shortest line distance (Good if diagonal movement was allowed)
-            return math.sqrt((x1 - x2)**2 + (y1 - y2)**2)
-            
-        elif self.heuristic_type == "chebyshev":
-            # Also known as Diagonal distance (Max of dx, dy)
-            return max(abs(x1 - x2), abs(y1 - y2))
-            
-        else:
-            # If "none" or unknown, behave like Dijkstra (h=0)
-            return 0
+        return self._heuristic(a, b)
+
+    def clear_cache(self):
+        """Drops the cached heuristic table, so the next query starts cold."""
+        self._table = None
 
-    def solve(self, start=(0, 0), goal=None):
+    def solve(self, start=(0, 0), goal=None, stats=False):
+        # Opt-in instrumentation: returns (path, nodes_explored, SearchStats). Runs the query
+        # up to three times: a timed solve(), an events() pass for the counters and a
+        # traced solve() for memory (see SearchStats.measure)
+        if stats:
+            return SearchStats.measure(self, start, goal)
+
+        if goal is None:
+            goal = (self.n - 1, self.n - 1)
+
+        # Start and goal in different connected components: nothing to search
+        if not self.maze_obj.reachable(start, goal):
+            return [], 0
+
+        if self.bidirectional:
+            return self._solve_bidirectional(start, goal)
+        if self.graph:
+            graph = self.maze_obj.junction_graph()
+            return graph.search(self.maze_obj.index(start), self.maze_obj.index(goal),
+                                heuristic_type=self.heuristic_type)
+
+        return run_search(self._search(start, goal))
+
+    def events(self, start=(0, 0), goal=None):
+        """
+        The cell-level solve() as a lazy stream of (kind, cell) events (see
+        SearchEvents); bidirectional / graph settings are not streamed.
+        """
         if goal is None:
             goal = (self.n - 1, self.n - 1)
+        if not self.maze_obj.reachable(start, goal):
+            return
+        yield from self._search(start, goal, emit=True)
+
+    def _search(self, start, goal, emit=False):
+        """The cell-level search behind solve() and events(); yields events only with emit."""
+        offsets, neighbors = self.maze_obj.adjacency()
+        n = self.n
+        size = n * n
+        s = self.maze_obj.index(start)
+        g = self.maze_obj.index(goal)
+
+        if self.precompute:
+            h = self._heuristic_lookup(goal)
+        else:
+            h = flat_heuristic(self.heuristic_type, n, goal)
 
+        # Entries are (f, -g, id): among equal f the deepest node (larger g) is
+        # expanded first, which is closer to the goal and avoids re-expansions
         open_set = []
-        heapq.heappush(open_set, (0, start))
-        came_from = {start: None}
-        g_score = {start: 0}
-        
+        heapq.heappush(open_set, (0, 0, s))
+        came_from = array('i', [-1]) * size
+        came_from[s] = s
+        # -1 marks "no g-score yet"
+        g_score = array('q', [-1]) * size
+        g_score[s] = 0
+
         nodes_explored = 0
-        visited_for_count = set()
+        visited_for_count = bytearray(size)
+        if emit:
+            yield (PUSH, start)
 
         while open_set:
-            current_f, current = heapq.heappop(open_set)
+            current_f, _, current = heapq.heappop(open_set)
 
-            if current in visited_for_count:
+            if visited_for_count[current]:
+                if emit:
+                    yield (STALE, divmod(current, n))
                 continue
-            
-            visited_for_count.add(current)
+
+            visited_for_count[current] = 1
             nodes_explored += 1
+            if emit:
+                yield (EXPAND, divmod(current, n))
+
+            if current == g:
+                break
+
+            tentative_g = g_score[current] + 1
+            for nxt in neighbors[offsets[current]:offsets[current + 1]]:
+                known = g_score[nxt]
+                if known == -1 or tentative_g < known:
+                    came_from[nxt] = current
+                    g_score[nxt] = tentative_g
+
+                    f = tentative_g + h(nxt)
+                    heapq.heappush(open_set, (f, -tentative_g, nxt))
+                    if emit:
+                        yield (PUSH, divmod(nxt, n))
+
+        path = self.maze_obj.trace_path(came_from, s, g)
+        if emit and path:
+            yield (GOAL, path)
+        return path, nodes_explored
 
-            if current == goal:
+    def _heuristic_lookup(self, goal):
+        """h(id) towards goal from the precomputed table, built once per (goal, maze.version)."""
+        key = (goal, self.maze_obj.version)
+        if self._table is None or self._table[:2] != key:
+            table = heuristic_table(self.heuristic_type, self.n, goal).tolist()
+            self._table = key + (table.__getitem__,)
+        return self._table[2]
+
+    def solve_many(self, pairs):
+        """
+        Answers many (start, goal) queries at once. One search serves every
+        query sharing a start or goal, and no single heuristic aims at all
+        of its targets, so this runs the uninformed multi-target sweep of
+        BatchSolve.solve_many. Paths are still shortest.
+        """
+        return solve_many(self.maze_obj, pairs)
+
+    def _solve_bidirectional(self, start, goal):
+        """
+        Bidirectional A* with the "average" potential p(v) = (h(v, goal) - h(v, start)) / 2.
+        The forward search (from start) orders its queue by g + p and the backward
+        search (from goal) by g - p, so both run on the same consistent reduced
+        edge costs. mu is the best start-goal cost seen where the two searches
+        touch; the search stops once top_forward + top_backward >= mu + p(goal) - p(start),
+        which (as in bidirectional Dijkstra) proves nothing cheaper is left.
+        """
+        offsets, neighbors = self.maze_obj.adjacency()
+        n = self.n
+        size = n * n
+        s = self.maze_obj.index(start)
+        g = self.maze_obj.index(goal)
+
+        if s == g:
+            return [start], 1
+        # Walls are never entered, so the backward search must not leave a walled goal
+        if self.maze_obj.cells[g]:
+            return [], 0
+
+        h_goal = flat_heuristic(self.heuristic_type, n, goal)
+        h_start = flat_heuristic(self.heuristic_type, n, start)
+
+        def potential(idx):
+            return (h_goal(idx) - h_start(idx)) / 2
+
+        p_start, p_goal = potential(s), potential(g)
+
+        # Index 0 = forward (start -> goal), 1 = backward (goal -> start)
+        # Keys are shifted so each root starts at 0: forward g + p - p(start),
+        # backward g - p + p(goal)
+        sign = (1, -1)
+        shift = (-p_start, p_goal)
+        # Entries are (key, -g, id), breaking key ties towards larger g
+        open_sets = ([(0, 0, s)], [(0, 0, g)])
+        came_from = (array('i', [-1]) * size, array('i', [-1]) * size)
+        g_score = (array('q', [-1]) * size, array('q', [-1]) * size)
+        closed = (bytearray(size), bytearray(size))
+        came_from[0][s], g_score[0][s] = s, 0
+        came_from[1][g], g_score[1][g] = g, 0
+
+        nodes_explored = 0
+        mu = None
+        meet = -1
+
+        while open_sets[0] and open_sets[1]:
+            # Termination: no remaining path can be cheaper than mu
+            if mu is not None and open_sets[0][0][0] + open_sets[1][0][0] >= mu + p_goal - p_start:
                 break
 
-            x, y = current
-            for dx, dy in [(1,0), (-1,0), (0,1), (0,-1)]:
-                nx, ny = x + dx, y + dy
-
-                if 0 <= nx < self.n and 0 <= ny < self.n and self.maze[nx][ny] == 0:
-                    tentative_g = g_score[current] + 1
-
-                    if (nx, ny) not in g_score or tentative_g < g_score[(nx, ny)]:
-                        came_from[(nx, ny)] = current
-                        g_score[(nx, ny)] = tentative_g
-                        
-                        # Use the dynamic heuristic method here
-                        f = tentative_g + self.heuristic((nx, ny), goal)
-                        heapq.heappush(open_set, (f, (nx, ny)))
-
-        path = []
-        cur = goal
-        if cur in came_from:
-            while cur is not None:
-                path.append(cur)
-                cur = came_from[cur]
-            path.reverse()
-        
-        return path, nodes_explored
\ No newline at end of file
+            # Advance the side whose best key is smaller
+            side = 0 if open_sets[0][0][0] <= open_sets[1][0][0] else 1
+            open_set = open_sets[side]
+            scores, other_scores = g_score[side], g_score[1 - side]
+            parents, done = came_from[side], closed[side]
+
+            current_key, _, current = heapq.heappop(open_set)
+            if done[current]:
+                continue
+            done[current] = 1
+            nodes_explored += 1
+
+            tentative_g = scores[current] + 1
+            for nxt in neighbors[offsets[current]:offsets[current + 1]]:
+                known = scores[nxt]
+                if known == -1 or tentative_g < known:
+                    parents[nxt] = current
+                    scores[nxt] = tentative_g
+                    key = tentative_g + sign[side] * potential(nxt) + shift[side]
+                    heapq.heappush(open_set, (key, -tentative_g, nxt))
+
+                    # The two searches touch here: candidate full path
+                    if other_scores[nxt] != -1:
+                        total = tentative_g + other_scores[nxt]
+                        if mu is None or total < mu:
+                            mu, meet = total, nxt
+
+        if meet == -1:
+            return [], nodes_explored
+
+        # start -> meet from the forward tree, then meet -> goal from the backward tree
+        path = self.maze_obj.trace_path(came_from[0], s, meet)
+        cur = meet
+        while cur != g:
+            cur = came_from[1][cur]
+            path.append(divmod(cur, n))
+
+        return path, nodes_explored
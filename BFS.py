@@ -1,46 +1,255 @@
+from array import array
 from collections import deque
 
+import numpy as np
+
+from BatchSolve import solve_many
+from Maze import DIRECTIONS
+from SearchEvents import PUSH, EXPAND, GOAL, run_search
+from SearchStats import SearchStats
+
+# Index into DIRECTIONS of the reverse move (down <-> up, right <-> left)
+OPPOSITE = [1, 0, 3, 2]
+
 class BFS:
-    def __init__(self, maze):
-        self.maze = maze.grid
+    def __init__(self, maze, mode="queue"):
+        self.maze_obj = maze
         self.n = maze.n
+        # "queue"      -> classic one-cell-at-a-time BFS
+        # "vectorized" -> whole-frontier NumPy BFS over a goal-rooted distance field
+        # "bidirectional" -> meet-in-the-middle BFS from both start and goal
+        # "graph"      -> shortest path on the maze's junction graph (corridors collapsed)
+        self.mode = mode.lower()
+        # Cached goal-rooted field: (maze_version, goal_id, dist, parent_dir)
+        self._field = None
+
+    def clear_cache(self):
+        """Drops the cached distance field, so the next query starts cold."""
+        self._field = None
+
+    def solve(self, start=(0, 0), goal=None, stats=False):
+        # Opt-in instrumentation: returns (path, nodes_explored, SearchStats). Runs the query
+        # up to three times: a timed solve(), an events() pass for the counters and a
+        # traced solve() for memory (see SearchStats.measure)
+        if stats:
+            return SearchStats.measure(self, start, goal)
+
+        if goal is None:
+            goal = (self.n - 1, self.n - 1)
+
+        # Start and goal in different connected components: nothing to search
+        if not self.maze_obj.reachable(start, goal):
+            return [], 0
 
-    def solve(self, start=(0, 0), goal=None):
+        if self.mode == "vectorized":
+            return self._solve_from_field(start, goal)
+        if self.mode == "bidirectional":
+            return self._solve_bidirectional(start, goal)
+        if self.mode == "graph":
+            # Corridors have lengths, so this is a shortest-steps search, not a hop count
+            graph = self.maze_obj.junction_graph()
+            return graph.search(self.maze_obj.index(start), self.maze_obj.index(goal))
+
+        return run_search(self._search(start, goal))
+
+    def events(self, start=(0, 0), goal=None):
+        """
+        The classic queue search as a lazy stream of (kind, cell) events
+        (see SearchEvents). Same order and expansions as solve() in "queue" mode.
+        """
         if goal is None:
             goal = (self.n - 1, self.n - 1)
+        if not self.maze_obj.reachable(start, goal):
+            return
+        yield from self._search(start, goal, emit=True)
+
+    def _search(self, start, goal, emit=False):
+        """The queue search behind solve() and events(); yields events only with emit."""
+        # Search runs on flat integer ids over the maze's shared neighbor table
+        offsets, neighbors = self.maze_obj.adjacency()
+        n = self.n
+        s = self.maze_obj.index(start)
+        g = self.maze_obj.index(goal)
 
-        queue = deque([start])
-        visited = set([start])
-        parent = {start: None}
+        queue = deque([s])
+        # parent[i] == -1 means unvisited; start is marked as its own parent
+        parent = array('i', [-1]) * (n * n)
+        parent[s] = s
         nodes_explored = 0
+        if emit:
+            yield (PUSH, start)
 
         while queue:
             current = queue.popleft()
             nodes_explored += 1
+            if emit:
+                yield (EXPAND, divmod(current, n))
 
-            if current == goal:
+            if current == g:
                 break
 
-            x, y = current
-            for dx, dy in [(1,0), (-1,0), (0,1), (0,-1)]:
-                nx, ny = x + dx, y + dy
-
-                if (
-                    0 <= nx < self.n and
-                    0 <= ny < self.n and
-                    self.maze[nx][ny] == 0 and
-                    (nx, ny) not in visited
-                ):
-                    visited.add((nx, ny))
-                    parent[(nx, ny)] = current
-                    queue.append((nx, ny))
+            for nxt in neighbors[offsets[current]:offsets[current + 1]]:
+                if parent[nxt] == -1:
+                    parent[nxt] = current
+                    queue.append(nxt)
+                    if emit:
+                        yield (PUSH, divmod(nxt, n))
 
         # reconstruct path
-        path = []
-        cur = goal
-        while cur is not None and cur in parent:
-            path.append(cur)
-            cur = parent[cur]
-        path.reverse()
-
-        return path, nodes_explored
\ No newline at end of file
+        path = self.maze_obj.trace_path(parent, s, g)
+        if emit and path:
+            yield (GOAL, path)
+        return path, nodes_explored
+
+    def solve_many(self, pairs):
+        """
+        Answers many (start, goal) queries at once: queries sharing a start or
+        goal share one multi-target BFS (see BatchSolve.solve_many).
+        Returns [(path, nodes_explored)] in input order.
+        """
+        return solve_many(self.maze_obj, pairs)
+
+    def _solve_bidirectional(self, start, goal):
+        """
+        Meet-in-the-middle BFS. Each round expands one complete layer of the
+        smaller frontier; once a layer touches the other side, the best
+        meeting point of that whole layer is taken, which keeps the path optimal.
+        """
+        offsets, neighbors = self.maze_obj.adjacency()
+        size = self.n * self.n
+        s = self.maze_obj.index(start)
+        g = self.maze_obj.index(goal)
+
+        if s == g:
+            return [start], 1
+        # Walls are never entered, so the backward search must not leave a walled goal
+        if self.maze_obj.cells[g]:
+            return [], 0
+
+        # Forward side grows from start, backward side from goal
+        parent_f = array('i', [-1]) * size
+        parent_b = array('i', [-1]) * size
+        dist_f = array('i', [-1]) * size
+        dist_b = array('i', [-1]) * size
+        parent_f[s], dist_f[s] = s, 0
+        parent_b[g], dist_b[g] = g, 0
+        frontier_f, frontier_b = [s], [g]
+        nodes_explored = 0
+
+        best = None  # (total_length, u, v): edge u -> v joins the two trees
+        while frontier_f and frontier_b and best is None:
+            forward = len(frontier_f) <= len(frontier_b)
+            if forward:
+                frontier, parent, dist, other_dist = frontier_f, parent_f, dist_f, dist_b
+            else:
+                frontier, parent, dist, other_dist = frontier_b, parent_b, dist_b, dist_f
+
+            next_frontier = []
+            for current in frontier:
+                nodes_explored += 1
+                step = dist[current] + 1
+                for nxt in neighbors[offsets[current]:offsets[current + 1]]:
+                    if other_dist[nxt] != -1:
+                        total = step + other_dist[nxt]
+                        if best is None or total < best[0]:
+                            best = (total, current, nxt) if forward else (total, nxt, current)
+                    if parent[nxt] == -1:
+                        parent[nxt] = current
+                        dist[nxt] = step
+                        next_frontier.append(nxt)
+
+            if forward:
+                frontier_f = next_frontier
+            else:
+                frontier_b = next_frontier
+
+        if best is None:
+            return [], nodes_explored
+
+        # start -> u comes from the forward tree, v -> goal from the backward tree
+        _, u, v = best
+        path = self.maze_obj.trace_path(parent_f, s, u)
+        cur = v
+        while True:
+            path.append(divmod(cur, self.n))
+            if cur == g:
+                break
+            cur = parent_b[cur]
+
+        return path, nodes_explored
+
+    def distance_field(self, root, with_parents=False):
+        """
+        Vectorized BFS from `root` that advances the whole frontier per level.
+        Returns an (n, n) int32 array of step distances (-1 = unreachable) and,
+        if requested, an (n, n) int8 array holding for each reached cell the
+        DIRECTIONS index of its move back towards `root` (-1 = none).
+        """
+        n = self.n
+        size = n * n
+        open_flat = (self.maze_obj.as_array() == 0).ravel()
+
+        dist = np.full(size, -1, dtype=np.int32)
+        parent_dir = np.full(size, -1, dtype=np.int8) if with_parents else None
+
+        r = self.maze_obj.index(root)
+        dist[r] = 0
+        # The frontier is kept as an array of flat ids, so each level costs
+        # O(frontier) instead of a full-grid shift
+        frontier = np.array([r], dtype=np.intp)
+        level = 0
+
+        while frontier.size:
+            level += 1
+            cols = frontier % n
+            reached = []
+            for k, (dr, dc) in enumerate(DIRECTIONS):
+                if dr:
+                    cand = frontier + dr * n
+                    ok = (cand >= 0) & (cand < size)
+                else:
+                    ok = (cols + dc >= 0) & (cols + dc < n)
+                    cand = frontier + dc
+                cand = cand[ok]
+                # Keep open cells not reached earlier (including by a previous
+                # direction on this same level, which also removes duplicates)
+                cand = cand[open_flat[cand] & (dist[cand] == -1)]
+                dist[cand] = level
+                if with_parents:
+                    parent_dir[cand] = OPPOSITE[k]
+                reached.append(cand)
+            frontier = np.concatenate(reached)
+
+        dist = dist.reshape(n, n)
+        if with_parents:
+            return dist, parent_dir.reshape(n, n)
+        return dist
+
+    def _solve_from_field(self, start, goal):
+        """
+        Answers a query by walking a goal-rooted distance field. The field is
+        cached per goal, so nodes_explored is the number of cells the field
+        settled when it had to be built, and 0 when it was reused.
+        """
+        g = self.maze_obj.index(goal)
+        nodes_explored = 0
+
+        version = self.maze_obj.version
+        if self._field is None or self._field[:2] != (version, g):
+            dist, parent_dir = self.distance_field(goal, with_parents=True)
+            self._field = (version, g, dist, parent_dir)
+            nodes_explored = int(np.count_nonzero(dist >= 0))
+        _, _, dist, parent_dir = self._field
+
+        x, y = start
+        if dist[x, y] == -1:
+            return [], nodes_explored
+
+        # Follow the parent directions downhill until we reach the goal
+        path = [(x, y)]
+        for _ in range(int(dist[x, y])):
+            dx, dy = DIRECTIONS[parent_dir[x, y]]
+            x, y = x + dx, y + dy
+            path.append((x, y))
+
+        return path, nodes_explored
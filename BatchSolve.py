@@ -0,0 +1,137 @@
+import heapq
+from array import array
+from collections import defaultdict, deque
+
+def group_queries(pairs, indexes):
+    """
+    Splits queries into groups that share an endpoint. Greedy cover: the
+    start or goal shared by the most still-ungrouped queries becomes the
+    root of the next group. Returns [(root, from_start, [query indexes])];
+    from_start tells whether the root is the shared start or the shared goal.
+    """
+    members = defaultdict(list)
+    for i in indexes:
+        start, goal = pairs[i]
+        members[(start, True)].append(i)
+        members[(goal, False)].append(i)
+
+    # Lazy max-heap on group size: stale sizes are recounted when they surface
+    heap = [(-len(queries), key) for key, queries in members.items()]
+    heapq.heapify(heap)
+    grouped = set()
+    groups = []
+    while heap:
+        size, key = heapq.heappop(heap)
+        queries = [i for i in members[key] if i not in grouped]
+        if not queries:
+            continue
+        if len(queries) < -size:
+            heapq.heappush(heap, (-len(queries), key))
+            continue
+        grouped.update(queries)
+        groups.append((key[0], key[1], queries))
+    return groups
+
+def multi_target_search(maze, root, targets, forward=True, use_costs=False):
+    """
+    One Dijkstra sweep from `root` (a flat id) that stops once every id in
+    `targets` is settled. Dial buckets as in UCS; with unit costs this is BFS.
+    With forward=False the search runs backwards (root is the goal), so
+    parent[] steps towards the root and costs are charged on the cell left.
+    Returns (parent, settled_at, expanded): settled_at[target] is the number
+    of cells expanded when that target was settled (absent if unreachable),
+    expanded the total when the search stopped.
+    """
+    offsets, neighbors = maze.adjacency()
+    size = maze.n * maze.n
+    if use_costs:
+        costs, width = maze.costs, maze.max_cost + 1
+    else:
+        costs, width = None, 2
+
+    # Unit costs: FIFO within a level keeps the same order as BFS
+    take = deque.popleft if costs is None else deque.pop
+    buckets = [deque() for _ in range(width)]
+    buckets[0].append(root)
+    pending = 1
+    parent = array('i', [-1]) * size
+    parent[root] = root
+    cost_so_far = array('q', [-1]) * size
+    cost_so_far[root] = 0
+    remaining = set(targets)
+    settled_at = {}
+    expanded = 0
+    current_cost = 0
+
+    while pending and remaining:
+        bucket = buckets[current_cost % width]
+        while bucket and remaining:
+            current = take(bucket)
+            pending -= 1
+            if cost_so_far[current] != current_cost:
+                continue
+            expanded += 1
+            if current in remaining:
+                remaining.discard(current)
+                settled_at[current] = expanded
+
+            for nxt in neighbors[offsets[current]:offsets[current + 1]]:
+                if costs is None:
+                    new_cost = current_cost + 1
+                elif forward:
+                    new_cost = current_cost + costs[nxt]
+                else:
+                    # Backwards, the step nxt -> current enters current
+                    new_cost = current_cost + costs[current]
+                known = cost_so_far[nxt]
+                if known == -1 or new_cost < known:
+                    cost_so_far[nxt] = new_cost
+                    parent[nxt] = current
+                    buckets[new_cost % width].append(nxt)
+                    pending += 1
+        current_cost += 1
+
+    return parent, settled_at, expanded
+
+def solve_many(maze, pairs, use_costs=False):
+    """
+    Answers many (start, goal) queries with shortest paths. Queries sharing a
+    start or a goal are answered by one multi-target search rooted there
+    (see group_queries); goal-rooted groups search backwards. Returns a list
+    of (path, nodes_explored) in input order, where nodes_explored is how far
+    the group's search had expanded when that query's target was settled.
+    """
+    n = maze.n
+    pairs = [(tuple(start), tuple(goal)) for start, goal in pairs]
+    results = [None] * len(pairs)
+
+    # Start and goal in different connected components: nothing to search
+    pending = []
+    for i, (start, goal) in enumerate(pairs):
+        if maze.reachable(start, goal):
+            pending.append(i)
+        else:
+            results[i] = ([], 0)
+
+    for root, from_start, queries in group_queries(pairs, pending):
+        r = maze.index(root)
+        # The other end of each query is a target of this group's search
+        ends = {i: maze.index(pairs[i][1] if from_start else pairs[i][0]) for i in queries}
+        parent, settled_at, expanded = multi_target_search(maze, r, set(ends.values()), from_start, use_costs)
+
+        for i, t in ends.items():
+            if t not in settled_at:
+                # Never reached (reachable() was not conclusive): only settled cells can be traced
+                results[i] = ([], expanded)
+                continue
+            if from_start:
+                path = maze.trace_path(parent, r, t)
+            else:
+                # Backwards search: parent[] already points along start -> goal
+                cells = [t]
+                while cells[-1] != r:
+                    cells.append(parent[cells[-1]])
+                path = [divmod(cell, n) for cell in cells]
+            results[i] = (path, settled_at[t])
+
+    return results
@@ -0,0 +1,162 @@
+import argparse
+import csv
+import json
+import math
+import random
+import statistics
+import time
+
+from Maze import Maze
+from BFS import BFS
+from DFS import DFS
+from AStarSearch import AStarSearch
+from JPS import JPS
+from UCS import UCS
+from IDS import IDS
+from HillClimbing import HillClimbing
+from GeneticAlgorithm import GeneticAlgorithm
+from GreedyBFS import GreedyBFS
+from ParallelRunner import ParallelRunner
+
+# Name -> factory(maze). Names match the labels used by Visualizer.main
+ALGORITHMS = {
+    "BFS": lambda maze: BFS(maze),
+    "DFS": lambda maze: DFS(maze),
+    "UCS": lambda maze: UCS(maze),
+    "A* (Manhattan)": lambda maze: AStarSearch(maze, heuristic_type="manhattan"),
+    "JPS": lambda maze: JPS(maze),
+    "IDS": lambda maze: IDS(maze),
+    "Greedy BFS": lambda maze: GreedyBFS(maze),
+    "Hill Climbing": lambda maze: HillClimbing(maze),
+    "Genetic Algo": lambda maze: GeneticAlgorithm(maze, population_size=100, generations=200),
+}
+
+CSV_FIELDS = ["algorithm", "size", "wall_prob", "seed", "solved", "path_length",
+              "nodes_explored", "pushes", "stale_pops", "peak_frontier",
+              "median_ms", "p95_ms", "min_ms", "peak_memory_kb", "repeat"]
+
+def percentile(values, q):
+    """Nearest-rank percentile of a non-empty list (q in 0..100)."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+def run_case(name, maze, seed, warmup=1, repeat=5):
+    """
+    Benchmarks one algorithm on one maze.
+    Timing runs use perf_counter_ns; peak memory and the frontier counters
+    come from one extra solve(stats=True) call so the instrumentation
+    overhead never pollutes the timings.
+    """
+    start = (0, 0)
+    goal = (maze.n - 1, maze.n - 1)
+    factory = ALGORITHMS[name]
+
+    def run_once(stats=False):
+        # Re-seed so randomized solvers (Genetic Algo) are repeatable per run
+        random.seed(seed)
+        solver = factory(maze)
+        return solver.solve(start, goal, stats=stats)
+
+    # Build the shared neighbor table and component labels outside the timed region
+    maze.adjacency()
+    maze.components()
+
+    for _ in range(warmup):
+        run_once()
+
+    times_ms = []
+    for _ in range(repeat):
+        t0 = time.perf_counter_ns()
+        path, nodes = run_once()
+        times_ms.append((time.perf_counter_ns() - t0) / 1e6)
+
+    stats = run_once(stats=True)[2]
+
+    return {
+        "algorithm": name,
+        "size": maze.n,
+        "wall_prob": maze.wall_prob,
+        "seed": seed,
+        "solved": bool(path) and path[-1] == goal,
+        "path_length": len(path),
+        "nodes_explored": nodes,
+        "pushes": stats.pushes,
+        "stale_pops": stats.stale_pops,
+        "peak_frontier": stats.peak_frontier,
+        "median_ms": statistics.median(times_ms),
+        "p95_ms": percentile(times_ms, 95),
+        "min_ms": min(times_ms),
+        "peak_memory_kb": stats.peak_memory / 1024,
+        "repeat": repeat,
+    }
+
+def _run_case_job(maze, name, seed, warmup, repeat):
+    """ParallelRunner job adapter: the maze comes first."""
+    return run_case(name, maze, seed, warmup, repeat)
+
+def run_sweep(sizes, wall_probs, seeds, algorithms, warmup=1, repeat=5, verbose=True, workers=1):
+    """
+    Runs every algorithm on every (size, wall_prob, seed) maze and returns the result records.
+    With workers > 1 the cases are spread over a process pool; each case is
+    still timed inside the process that runs it.
+    """
+    mazes = []
+    cases = []
+    for size in sizes:
+        for wall_prob in wall_probs:
+            for seed in seeds:
+                mazes.append(Maze(size, wall_prob=wall_prob, seed=seed))
+                for name in algorithms:
+                    cases.append((len(mazes) - 1, (name, seed, warmup, repeat)))
+
+    if workers > 1:
+        with ParallelRunner(mazes, max_workers=workers) as runner:
+            results = runner.map(_run_case_job, cases)
+    else:
+        results = [_run_case_job(mazes[maze_index], *args) for maze_index, args in cases]
+
+    if verbose:
+        for record in results:
+            print(f"{record['algorithm']:>15} n={record['size']:<5} p={record['wall_prob']:<5} "
+                  f"seed={record['seed']:<4} "
+                  f"median={record['median_ms']:.3f} ms  p95={record['p95_ms']:.3f} ms  "
+                  f"nodes={record['nodes_explored']}  len={record['path_length']}  "
+                  f"peak={record['peak_memory_kb']:.0f} KB")
+    return results
+
+def save_results(results, prefix):
+    """Writes results to <prefix>.json and <prefix>.csv."""
+    with open(prefix + ".json", "w") as f:
+        json.dump(results, f, indent=2)
+    with open(prefix + ".csv", "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+    print(f"Results saved to '{prefix}.json' and '{prefix}.csv'")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the maze solvers over a sweep of mazes.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 20],
+                        help="maze sizes N (N x N grids)")
+    parser.add_argument("--wall-probs", type=float, nargs="+", default=[0.3],
+                        help="wall probabilities")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0, 1, 2],
+                        help="maze seeds")
+    parser.add_argument("--algorithms", nargs="+", default=list(ALGORITHMS),
+                        choices=list(ALGORITHMS), metavar="NAME",
+                        help="algorithms to run (default: all)")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed warm-up runs per case")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per case")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes to spread the cases over (default: 1, sequential)")
+    parser.add_argument("--output", default="benchmark_results",
+                        help="output prefix; writes <prefix>.json and <prefix>.csv")
+    args = parser.parse_args(argv)
+
+    results = run_sweep(args.sizes, args.wall_probs, args.seeds, args.algorithms,
+                        args.warmup, args.repeat, workers=args.workers)
+    save_results(results, args.output)
+
+if __name__ == "__main__":
+    main()
@@ -1,44 +1,71 @@
+from array import array
+
+from SearchEvents import PUSH, EXPAND, GOAL, run_search
+from SearchStats import SearchStats
+
 class DFS:
     def __init__(self, maze):
-        self.maze = maze.grid
+        self.maze_obj = maze
         self.n = maze.n
 
-    def solve(self, start=(0, 0), goal=None):
+    def solve(self, start=(0, 0), goal=None, stats=False):
+        # Opt-in instrumentation: returns (path, nodes_explored, SearchStats). Runs the query
+        # up to three times: a timed solve(), an events() pass for the counters and a
+        # traced solve() for memory (see SearchStats.measure)
+        if stats:
+            return SearchStats.measure(self, start, goal)
+
+        if goal is None:
+            goal = (self.n - 1, self.n - 1)
+
+        # Start and goal in different connected components: nothing to search
+        if not self.maze_obj.reachable(start, goal):
+            return [], 0
+
+        return run_search(self._search(start, goal))
+
+    def events(self, start=(0, 0), goal=None):
+        """solve() as a lazy stream of (kind, cell) events (see SearchEvents)."""
         if goal is None:
             goal = (self.n - 1, self.n - 1)
+        if not self.maze_obj.reachable(start, goal):
+            return
+        yield from self._search(start, goal, emit=True)
 
-        stack = [start]
-        visited = set([start])
-        parent = {start: None}
+    def _search(self, start, goal, emit=False):
+        """The search behind solve() and events(); yields events only with emit."""
+        # Search runs on flat integer ids over the maze's shared neighbor table
+        offsets, neighbors = self.maze_obj.adjacency()
+        n = self.n
+        s = self.maze_obj.index(start)
+        g = self.maze_obj.index(goal)
+
+        stack = [s]
+        # parent[i] == -1 means unvisited; start is marked as its own parent
+        parent = array('i', [-1]) * (n * n)
+        parent[s] = s
         nodes_explored = 0
+        if emit:
+            yield (PUSH, start)
 
         while stack:
             current = stack.pop()   # LIFO
             nodes_explored += 1
+            if emit:
+                yield (EXPAND, divmod(current, n))
 
-            if current == goal:
+            if current == g:
                 break
 
-            x, y = current
-            for dx, dy in [(1,0), (-1,0), (0,1), (0,-1)]:
-                nx, ny = x + dx, y + dy
-
-                if (
-                    0 <= nx < self.n and
-                    0 <= ny < self.n and
-                    self.maze[nx][ny] == 0 and
-                    (nx, ny) not in visited
-                ):
-                    visited.add((nx, ny))
-                    parent[(nx, ny)] = current
-                    stack.append((nx, ny))
+            for nxt in neighbors[offsets[current]:offsets[current + 1]]:
+                if parent[nxt] == -1:
+                    parent[nxt] = current
+                    stack.append(nxt)
+                    if emit:
+                        yield (PUSH, divmod(nxt, n))
 
         # reconstruct path
-        path = []
-        cur = goal
-        while cur is not None and cur in parent:
-            path.append(cur)
-            cur = parent[cur]
-        path.reverse()
-
-        return path, nodes_explored
\ No newline at end of file
+        path = self.maze_obj.trace_path(parent, s, g)
+        if emit and path:
+            yield (GOAL, path)
+        return path, nodes_explored
@@ -1,24 +1,51 @@
-import matplotlib.pyplot as plt
-import numpy as np
+import argparse
+import json
+import statistics
 
-# Data
-algorithms = ['BFS', 'DFS', 'A* (Man)', 'UCS', 'IDS', 'Hill Climb', 'Genetic', 'Greedy']
-time_data = [0.08, 0.04, 0.15, 0.11, 0.52, 0.04, 129.26, 0.06]
-nodes_data = [46, 29, 31, 48, 407, 20, 11600, 23]
-path_data = [19, 21, 19, 19, 19, 21, 19, 19]
+import matplotlib.pyplot as plt
 
 # Colors for bars
-colors = ['#3498db', '#9b59b6', '#2ecc71', '#1abc9c', '#f1c40f', '#e67e22', '#e74c3c', '#34495e']
+colors = ['#3498db', '#9b59b6', '#2ecc71', '#1abc9c', '#f1c40f', '#e67e22', '#e74c3c', '#34495e', '#95a5a6']
+
+def load_chart_data(filename, size=None, wall_prob=None):
+    """
+    Reads Benchmark.py JSON output and aggregates it per algorithm (over seeds)
+    for one maze size / wall probability (defaults: the first ones in the file).
+    Returns (algorithms, time_data, nodes_data, path_data, size, wall_prob).
+    """
+    with open(filename) as f:
+        records = json.load(f)
+    if not records:
+        raise ValueError(f"No benchmark results in {filename}")
+
+    if size is None:
+        size = records[0]["size"]
+    if wall_prob is None:
+        wall_prob = records[0]["wall_prob"]
+    records = [r for r in records if r["size"] == size and r["wall_prob"] == wall_prob]
+
+    # Keep the order in which the benchmark ran the algorithms
+    algorithms = list(dict.fromkeys(r["algorithm"] for r in records))
+    time_data, nodes_data, path_data = [], [], []
+    for name in algorithms:
+        runs = [r for r in records if r["algorithm"] == name]
+        solved = [r for r in runs if r["solved"]]
+        time_data.append(round(statistics.median(r["median_ms"] for r in runs), 3))
+        nodes_data.append(round(statistics.mean(r["nodes_explored"] for r in runs), 1))
+        # Path length only means something for runs that reached the goal
+        path_data.append(round(statistics.mean(r["path_length"] for r in solved), 1) if solved else 0)
+
+    return algorithms, time_data, nodes_data, path_data, size, wall_prob
 
-def save_chart(data, title, ylabel, filename, log_scale=False):
+def save_chart(algorithms, data, title, ylabel, filename, log_scale=False):
     plt.figure(figsize=(10, 6))
-    bars = plt.bar(algorithms, data, color=colors)
-    
+    bars = plt.bar(algorithms, data, color=colors[:len(algorithms)])
+
     plt.title(title, fontsize=14, fontweight='bold')
     plt.ylabel(ylabel, fontsize=12)
     plt.xticks(rotation=45)
     plt.grid(axis='y', linestyle='--', alpha=0.7)
-    
+
     # Add value labels on top of bars
     for bar in bars:
         height = bar.get_height()
@@ -34,13 +61,28 @@ def save_chart(data, title, ylabel, filename, log_scale=False):
     plt.savefig(f"Images/{filename}") # Saves to Images folder
     plt.close()
 
-# 1. Path Length Comparison
-save_chart(path_data, 'Path Length Comparison (Lower is Better)', 'Steps', 'compare_path.png')
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Plot comparison charts from Benchmark.py results.")
+    parser.add_argument("results", nargs="?", default="benchmark_results.json",
+                        help="JSON file written by Benchmark.py")
+    parser.add_argument("--size", type=int, default=None, help="maze size to plot")
+    parser.add_argument("--wall-prob", type=float, default=None, help="wall probability to plot")
+    args = parser.parse_args(argv)
+
+    algorithms, time_data, nodes_data, path_data, size, wall_prob = load_chart_data(
+        args.results, args.size, args.wall_prob)
+    suffix = f" ({size}x{size}, wall_prob={wall_prob})"
+
+    # 1. Path Length Comparison
+    save_chart(algorithms, path_data, 'Path Length Comparison (Lower is Better)' + suffix, 'Steps', 'compare_path.png')
+
+    # 2. Nodes Explored (Log Scale due to Genetic Algo)
+    save_chart(algorithms, nodes_data, 'Nodes Explored Comparison (Efficiency)' + suffix, 'Nodes Count', 'compare_nodes.png', log_scale=True)
 
-# 2. Nodes Explored (Log Scale due to Genetic Algo)
-save_chart(nodes_data, 'Nodes Explored Comparison (Efficiency)', 'Nodes Count', 'compare_nodes.png', log_scale=True)
+    # 3. Time Comparison (Log Scale due to Genetic Algo)
+    save_chart(algorithms, time_data, 'Execution Time Comparison (Speed)' + suffix, 'Median Time (ms)', 'compare_time.png', log_scale=True)
 
-# 3. Time Comparison (Log Scale due to Genetic Algo)
-save_chart(time_data, 'Execution Time Comparison (Speed)', 'Time (ms)', 'compare_time.png', log_scale=True)
+    print("Charts generated successfully in the 'Images/' folder!")
 
-print("Charts generated successfully in the 'Images/' folder!")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -1,130 +1,417 @@
+import multiprocessing
+import queue
 import random
-import math
+from multiprocessing.connection import wait
+
+import numpy as np
+
+from Maze import Maze
+from Heuristics import get_heuristic, get_vectorized
+from SearchStats import SearchStats
 
 class GeneticAlgorithm:
-    def __init__(self, maze, population_size=100, mutation_rate=0.05, generations=500, heuristic_type="manhattan"):
-        self.maze = maze.grid
+    # What solve()'s nodes_explored counts (reported by SearchStats)
+    stats_unit = "individuals evaluated"
+
+    def __init__(self, maze, population_size=100, mutation_rate=0.05, generations=500, heuristic_type="manhattan",
+                 islands=1, migration_interval=10, migration_size=2):
+        if islands < 1:
+            raise ValueError(f"islands must be at least 1, got {islands}")
+        if migration_interval < 1:
+            raise ValueError(f"migration_interval must be at least 1, got {migration_interval}")
+        if migration_size < 0:
+            raise ValueError(f"migration_size must not be negative, got {migration_size}")
+        self.maze_obj = maze
         self.n = maze.n
         self.pop_size = population_size
         self.mutation_rate = mutation_rate
         self.generations = generations
         self.heuristic_type = heuristic_type.lower() # Store the heuristic choice
-        self.directions = [(0, 1), (0, -1), (1, 0), (-1, 0)] 
-        self.chromosome_length = self.n * self.n 
+        # Resolved once: scalar form for calculate_distance, array form for score()
+        self._distance = get_heuristic(self.heuristic_type)
+        self._distance_vectorized = get_vectorized(self.heuristic_type)
+        self.directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+        self.chromosome_length = self.n * self.n
+        # Genes are move codes: indexes into self.directions
+        self.move_dx = np.array([dx for dx, _ in self.directions], dtype=np.int64)
+        self.move_dy = np.array([dy for _, dy in self.directions], dtype=np.int64)
+        # Island mode: `islands` populations of population_size evolve in separate
+        # processes and send their best `migration_size` individuals to the next
+        # island every `migration_interval` generations
+        self.islands = islands
+        self.migration_interval = migration_interval
+        self.migration_size = migration_size
+        self.rng = None
 
-    def create_individual(self):
-        return [random.choice(self.directions) for _ in range(self.chromosome_length)]
+    def create_population(self):
+        """The whole population as a (pop_size, chromosome_length) array of move codes."""
+        return self.rng.integers(0, len(self.directions), size=(self.pop_size, self.chromosome_length), dtype=np.int8)
 
     def get_path_from_individual(self, individual):
+        n = self.n
+        # Flat byte grid: one index per move instead of nested-list lookups
+        cells = self.maze_obj.cells
+        directions = self.directions
+        goal = n * n - 1
         path = [(0, 0)]
         x, y = 0, 0
-        
-        for move in individual:
-            dx, dy = move
+
+        for code in np.asarray(individual).tolist():
+            dx, dy = directions[code]
             nx, ny = x + dx, y + dy
-            
-            if 0 <= nx < self.n and 0 <= ny < self.n and self.maze[nx][ny] == 0:
+
+            if 0 <= nx < n and 0 <= ny < n and cells[nx * n + ny] == 0:
                 x, y = nx, ny
                 path.append((x, y))
-                if (x, y) == (self.n - 1, self.n - 1):
+                if x * n + y == goal:
                     break
             else:
-                break 
-                
+                break
+
         return path
 
+    def decode_population(self, population, steps=None, pos=None, lengths=None, trail=None):
+        """
+        Decodes every individual at once, one move per step for the whole population.
+        An "alive" mask drops individuals as soon as they hit a wall or the border
+        (or reach the goal), exactly like get_path_from_individual.
+
+        Rows may also resume mid-chromosome from a known state:
+        steps[i] = next gene to read, pos[i] = flat cell reached so far,
+        lengths[i] = path length so far, trail[i, :lengths[i] - 1] = cells visited after (0, 0).
+        Returns (pos, lengths, consumed, trail); consumed[i] is how many genes
+        were read, i.e. the length of the effective prefix.
+        """
+        n = self.n
+        size = len(population)
+        length = self.chromosome_length
+        open_cells = self.maze_obj.as_array().ravel() == 0
+        goal = n * n - 1
+
+        if steps is None:
+            steps = np.zeros(size, dtype=np.int64)
+            pos = np.zeros(size, dtype=np.int64)
+            lengths = np.ones(size, dtype=np.int64)
+            trail = np.full((size, 16), -1, dtype=np.int32)
+
+        alive = np.flatnonzero(steps < length)
+        while alive.size:
+            codes = population[alive, steps[alive]]
+            r, c = np.divmod(pos[alive], n)
+            nr = r + self.move_dx[codes]
+            nc = c + self.move_dy[codes]
+            steps[alive] += 1
+
+            inside = (nr >= 0) & (nr < n) & (nc >= 0) & (nc < n)
+            ok = inside.copy()
+            ok[inside] = open_cells[nr[inside] * n + nc[inside]]
+
+            moved = alive[ok]
+            new_pos = nr[ok] * n + nc[ok]
+            pos[moved] = new_pos
+
+            # Record the move in the trail (grown on demand)
+            cols = lengths[moved] - 1
+            if cols.size and cols.max() >= trail.shape[1]:
+                trail = np.pad(trail, ((0, 0), (0, trail.shape[1])), constant_values=-1)
+            trail[moved, cols] = new_pos
+            lengths[moved] += 1
+
+            alive = moved[new_pos != goal]
+            alive = alive[steps[alive] < length]
+
+        return pos, lengths, steps, trail
+
     def calculate_distance(self, current, goal):
         """Helper method to calculate distance based on chosen heuristic."""
-        x1, y1 = current
-        x2, y2 = goal
-        
-        if self.heuristic_type == "manhattan":
-            return abs(x1 - x2) + abs(y1 - y2)
-        elif self.heuristic_type == "euclidean":
-            return math.sqrt((x1 - x2)**2 + (y1 - y2)**2)
-        elif self.heuristic_type == "chebyshev":
-            return max(abs(x1 - x2), abs(y1 - y2))
-        else:
-            return 0
+        return self._distance(current, goal)
 
     def fitness(self, individual):
         path = self.get_path_from_individual(individual)
         final_pos = path[-1]
         goal = (self.n - 1, self.n - 1)
-        
+
         # USE THE DYNAMIC CALCULATION HERE
         dist = self.calculate_distance(final_pos, goal)
-        
+
         # Max distance reference needs to be large enough for any heuristic
-        max_dist = 2 * self.n 
-        
+        max_dist = 2 * self.n
+
         score = max_dist - dist
-        
+
         if final_pos == goal:
             score += 100
             score += (self.chromosome_length - len(path))
-            
+
         return max(0, score) # Ensure score isn't negative
 
-    def selection(self, population, fitnesses):
-        selected = []
-        for _ in range(self.pop_size):
-            i, j = random.randint(0, self.pop_size-1), random.randint(0, self.pop_size-1)
-            if fitnesses[i] > fitnesses[j]:
-                selected.append(population[i])
-            else:
-                selected.append(population[j])
-        return selected
-
-    def crossover(self, parent1, parent2):
-        if random.random() < 0.7: 
-            point = random.randint(1, self.chromosome_length - 1)
-            child1 = parent1[:point] + parent2[point:]
-            child2 = parent2[:point] + parent1[point:]
-            return child1, child2
-        return parent1, parent2
-
-    def mutate(self, individual):
-        for i in range(len(individual)):
-            if random.random() < self.mutation_rate:
-                individual[i] = random.choice(self.directions)
-        return individual
-
-    def solve(self, start=(0,0), goal=None):
-        population = [self.create_individual() for _ in range(self.pop_size)]
-        total_individuals_evaluated = 0
+    def score(self, pos, lengths):
+        """Vectorized fitness from decoded final cells and path lengths (same values as fitness())."""
+        n = self.n
+        x, y = np.divmod(pos, n)
+        # Goal is always the bottom-right corner here
+        dx = np.abs(x - (n - 1))
+        dy = np.abs(y - (n - 1))
+        dist = self._distance_vectorized(dx, dy)
+
+        reached = pos == n * n - 1
+        score = 2 * n - dist
+        score = score + np.where(reached, 100 + (self.chromosome_length - lengths), 0)
+        return np.maximum(0, score)
+
+    def evaluate(self, population):
+        """Decodes and scores a whole population from scratch."""
+        pos, lengths, _, _ = self.decode_population(population)
+        return self.score(pos, lengths)
+
+    def selection(self, fitnesses):
+        """Binary tournament for the whole population in one shot; returns the winners' row indexes."""
+        i = self.rng.integers(0, self.pop_size, size=self.pop_size)
+        j = self.rng.integers(0, self.pop_size, size=self.pop_size)
+        return np.where(fitnesses[i] > fitnesses[j], i, j)
+
+    def crossover(self, selected):
+        """
+        One-point crossover of consecutive pairs (0-1, 2-3, ...), applied to 70%
+        of the pairs; the other pairs are copied unchanged.
+        Returns (children, source, keep): child k starts with the first keep[k]
+        genes of selected[source[k]].
+        """
+        size, length = selected.shape
+        first = np.arange(0, size, 2)
+        second = first + 1
+        # Odd population: the last individual pairs with the first one
+        second[second >= size] = 0
+
+        pairs = len(first)
+        if length < 2:
+            do_cross = np.zeros(pairs, dtype=bool)
+        else:
+            do_cross = self.rng.random(pairs) < 0.7
+        points = np.where(do_cross, self.rng.integers(1, max(length, 2), size=pairs), length)
+        take_first = np.arange(length)[None, :] < points[:, None]
+
+        children = np.empty((pairs * 2, length), dtype=selected.dtype)
+        children[0::2] = np.where(take_first, selected[first], selected[second])
+        children[1::2] = np.where(take_first, selected[second], selected[first])
+
+        source = np.empty(pairs * 2, dtype=np.int64)
+        source[0::2] = first
+        source[1::2] = second
+        keep = np.repeat(points, 2)
+        return children[:size], source[:size], keep[:size]
+
+    def mutate(self, population):
+        """
+        Replaces each gene with a random move with probability mutation_rate (in place).
+        Returns the index of each row's first mutated gene (chromosome_length if none).
+        """
+        mask = self.rng.random(population.shape) < self.mutation_rate
+        population[mask] = self.rng.integers(0, len(self.directions), size=int(mask.sum()), dtype=population.dtype)
+        return np.where(mask.any(axis=1), mask.argmax(axis=1), population.shape[1])
+
+    def next_generation(self, population, fitnesses, state):
+        """
+        Selection + crossover + mutation, then decoding of the new population.
+        A child whose unchanged leading genes cover its parent's whole effective
+        prefix has the same fitness as the parent, so its decoded state is copied;
+        any other child resumes from the parent's position where it diverges, so
+        only the changed tail is simulated.
+        Returns (population, state, individuals_simulated).
+        """
+        pos, lengths, consumed, trail = state
+
+        winners = self.selection(fitnesses)
+        children, source, keep = self.crossover(population[winners])
+        keep = np.minimum(keep, self.mutate(children))
+        parents = winners[source]
+
+        new_pos = pos[parents]
+        new_lengths = lengths[parents]
+        new_consumed = consumed[parents]
+        new_trail = trail[parents]
+
+        resume = np.flatnonzero(keep < new_consumed)
+        if resume.size:
+            # Every gene before `keep` was a successful move of the parent
+            k = keep[resume]
+            start_pos = np.where(k > 0, new_trail[resume, np.maximum(k - 1, 0)], 0).astype(np.int64)
+            r_pos, r_lengths, r_consumed, r_trail = self.decode_population(
+                children[resume], k.copy(), start_pos, k + 1, new_trail[resume])
+            new_pos[resume] = r_pos
+            new_lengths[resume] = r_lengths
+            new_consumed[resume] = r_consumed
+            if r_trail.shape[1] > new_trail.shape[1]:
+                new_trail = np.pad(new_trail, ((0, 0), (0, r_trail.shape[1] - new_trail.shape[1])),
+                                   constant_values=-1)
+            new_trail[resume, :r_trail.shape[1]] = r_trail
+
+        return children, (new_pos, new_lengths, new_consumed, new_trail), int(resume.size)
+
+    def insert_migrants(self, population, state, rows, migrants):
+        """Overwrites population[rows] with migrant chromosomes and decodes them into the state."""
+        population[rows] = migrants
+        m_pos, m_lengths, m_consumed, m_trail = self.decode_population(migrants)
+        pos, lengths, consumed, trail = state
+        pos[rows] = m_pos
+        lengths[rows] = m_lengths
+        consumed[rows] = m_consumed
+        if m_trail.shape[1] > trail.shape[1]:
+            trail = np.pad(trail, ((0, 0), (0, m_trail.shape[1] - trail.shape[1])), constant_values=-1)
+        trail[rows] = -1
+        trail[rows, :m_trail.shape[1]] = m_trail
+        return population, (pos, lengths, consumed, trail)
+
+    def solve(self, start=(0,0), goal=None, stats=False):
+        # Opt-in instrumentation: returns (path, nodes_explored, SearchStats). Runs the query
+        # up to three times: a timed solve(), an events() pass for the counters and a
+        # traced solve() for memory (see SearchStats.measure)
+        if stats:
+            return SearchStats.measure(self, start, goal)
+
+        # The goal is always the bottom-right corner; skip evolving when it is cut off
+        if not self.maze_obj.reachable((0, 0), (self.n - 1, self.n - 1)):
+            return [], 0
+
+        if self.islands > 1:
+            return self._solve_islands()
+
+        # Seeded from the random module so random.seed() still makes runs repeatable
+        self.rng = np.random.default_rng(random.getrandbits(64))
+        goal_id = self.n * self.n - 1
+        population = self.create_population()
+        state = self.decode_population(population)
+        # Counts individuals actually simulated; inherited fitness values are free
+        total_individuals_evaluated = len(population)
         
         best_solution = []
         solved = False
 
         for gen in range(self.generations):
-            fitness_scores = [self.fitness(ind) for ind in population]
-            total_individuals_evaluated += len(population)
-            
-            max_fit = max(fitness_scores)
-            best_ind = population[fitness_scores.index(max_fit)]
-            
-            if max_fit >= 100:
+            fitness_scores = self.score(state[0], state[1])
+
+            best = int(np.argmax(fitness_scores))
+            best_ind = population[best]
+
+            # Any goal-reaching individual outscores every other one (score()),
+            # so the fittest one has reached the goal if anyone has
+            if state[0][best] == goal_id:
                 best_solution = self.get_path_from_individual(best_ind)
                 solved = True
                 break
-            
-            selected_pop = self.selection(population, fitness_scores)
-            
-            next_pop = []
-            for i in range(0, self.pop_size, 2):
-                p1 = selected_pop[i]
-                p2 = selected_pop[i+1] if i+1 < len(selected_pop) else selected_pop[0]
-                
-                c1, c2 = self.crossover(p1, p2)
-                next_pop.append(self.mutate(c1))
-                next_pop.append(self.mutate(c2))
-            
-            population = next_pop
+
+            population, state, simulated = self.next_generation(population, fitness_scores, state)
+            total_individuals_evaluated += simulated
 
         if not solved:
-            fitness_scores = [self.fitness(ind) for ind in population]
-            best_ind = population[fitness_scores.index(max(fitness_scores))]
+            fitness_scores = self.score(state[0], state[1])
+            best_ind = population[int(np.argmax(fitness_scores))]
             best_solution = self.get_path_from_individual(best_ind)
 
-        return best_solution, total_individuals_evaluated
\ No newline at end of file
+        return best_solution, total_individuals_evaluated
+
+    def _solve_islands(self):
+        """
+        Island model: runs one process per island and returns the goal-reaching path
+        from whichever island solves first (or the fittest one when none does),
+        with total_individuals_evaluated summed over all islands.
+        """
+        params = {
+            "population_size": self.pop_size,
+            "mutation_rate": self.mutation_rate,
+            "generations": self.generations,
+            "heuristic_type": self.heuristic_type,
+        }
+        stop = multiprocessing.Event()
+        inboxes = [multiprocessing.Queue() for _ in range(self.islands)]
+        packed_maze = self.maze_obj.to_packed()
+
+        workers = {}
+        for i in range(self.islands):
+            # Each island reports on its own pipe; only the island holds the sending end
+            reader, writer = multiprocessing.Pipe(duplex=False)
+            # Ring topology: island i sends its migrants to island i + 1
+            args = (packed_maze, params, random.getrandbits(64), self.migration_interval,
+                    self.migration_size, inboxes[i], inboxes[(i + 1) % self.islands], stop, writer)
+            worker = multiprocessing.Process(target=_run_island, args=args)
+            worker.start()
+            writer.close()
+            workers[reader] = worker
+
+        # Block until some pipe is readable: a report, or end-of-file once an
+        # island that never reported has exited (it died)
+        outcomes = []
+        pending = list(workers)
+        while pending:
+            for reader in wait(pending):
+                pending.remove(reader)
+                try:
+                    outcomes.append(reader.recv())
+                except EOFError:
+                    dead = workers[reader]
+                    dead.join()
+                    for worker in workers.values():
+                        worker.terminate()
+                        worker.join()
+                    raise RuntimeError(f"GA island process died (exit code {dead.exitcode})")
+        for worker in workers.values():
+            worker.join()
+
+        total_individuals_evaluated = sum(evaluated for _, _, _, evaluated in outcomes)
+        solved = [path for is_solved, _, path, _ in outcomes if is_solved]
+        if solved:
+            return solved[0], total_individuals_evaluated
+        best = max(outcomes, key=lambda outcome: outcome[1])
+        return best[2], total_individuals_evaluated
+
+
+def _run_island(packed_maze, params, seed, migration_interval, migration_size, inbox, outbox, stop, report):
+    """
+    One island of GeneticAlgorithm._solve_islands, run in its own process.
+    Migration is asynchronous: migrants are sent without waiting and taken
+    from the inbox only if some have arrived, so islands never block each other.
+    Sends (solved, best_fitness, best_path, individuals_evaluated) on the report pipe.
+    """
+    # Unread migrants may be left in the queue when we stop; don't wait to flush them
+    outbox.cancel_join_thread()
+
+    ga = GeneticAlgorithm(Maze.from_packed(*packed_maze), **params)
+    ga.rng = np.random.default_rng(seed)
+    population = ga.create_population()
+    state = ga.decode_population(population)
+    evaluated = len(population)
+    migrants_count = min(migration_size, ga.pop_size)
+
+    goal_id = ga.n * ga.n - 1
+
+    for gen in range(ga.generations):
+        fitness_scores = ga.score(state[0], state[1])
+
+        best = int(np.argmax(fitness_scores))
+        if state[0][best] == goal_id:
+            stop.set()
+            report.send((True, float(fitness_scores[best]), ga.get_path_from_individual(population[best]), evaluated))
+            return
+        # Another island reached the goal
+        if stop.is_set():
+            break
+
+        if migrants_count and gen % migration_interval == migration_interval - 1:
+            order = np.argsort(fitness_scores, kind="stable")
+            outbox.put(population[order[-migrants_count:]].copy())
+            try:
+                arrived = inbox.get_nowait()
+            except queue.Empty:
+                arrived = None
+            if arrived is not None:
+                # Migrants replace this island's weakest individuals
+                population, state = ga.insert_migrants(population, state, order[:len(arrived)], arrived)
+                evaluated += len(arrived)
+                fitness_scores = ga.score(state[0], state[1])
+
+        population, state, simulated = ga.next_generation(population, fitness_scores, state)
+        evaluated += simulated
+
+    fitness_scores = ga.score(state[0], state[1])
+    best = int(np.argmax(fitness_scores))
+    report.send((False, float(fitness_scores[best]), ga.get_path_from_individual(population[best]), evaluated))
@@ -1,8 +1,12 @@
 import heapq
+from array import array
+
+from SearchEvents import PUSH, EXPAND, GOAL, run_search
+from SearchStats import SearchStats
 
 class GreedyBFS:
     def __init__(self, maze):
-        self.maze = maze.grid
+        self.maze_obj = maze
         self.n = maze.n
 
     def heuristic(self, a, b):
@@ -12,52 +16,79 @@ class GreedyBFS:
         """
         return abs(a[0] - b[0]) + abs(a[1] - b[1])
 
-    def solve(self, start=(0, 0), goal=None):
+    def solve(self, start=(0, 0), goal=None, stats=False):
+        # Opt-in instrumentation: returns (path, nodes_explored, SearchStats). Runs the query
+        # up to three times: a timed solve(), an events() pass for the counters and a
+        # traced solve() for memory (see SearchStats.measure)
+        if stats:
+            return SearchStats.measure(self, start, goal)
+
+        if goal is None:
+            goal = (self.n - 1, self.n - 1)
+
+        # Start and goal in different connected components: nothing to search
+        if not self.maze_obj.reachable(start, goal):
+            return [], 0
+
+        return run_search(self._search(start, goal))
+
+    def events(self, start=(0, 0), goal=None):
+        """solve() as a lazy stream of (kind, cell) events (see SearchEvents)."""
         if goal is None:
             goal = (self.n - 1, self.n - 1)
+        if not self.maze_obj.reachable(start, goal):
+            return
+        yield from self._search(start, goal, emit=True)
+
+    def _search(self, start, goal, emit=False):
+        """The search behind solve() and events(); yields events only with emit."""
+        offsets, neighbors = self.maze_obj.adjacency()
+        n = self.n
+        s = self.maze_obj.index(start)
+        g = self.maze_obj.index(goal)
 
-        # Priority Queue stores tuples: (heuristic_cost, (x, y))
+        # Priority Queue stores tuples: (heuristic_cost, cell_id)
         open_set = []
         # We start with the heuristic distance of the start node
-        heapq.heappush(open_set, (self.heuristic(start, goal), start))
+        heapq.heappush(open_set, (self.heuristic(start, goal), s))
 
-        came_from = {start: None}
-        visited = set([start])
+        # came_from[i] == -1 doubles as the "not visited" flag
+        came_from = array('i', [-1]) * (n * n)
+        came_from[s] = s
         nodes_explored = 0
+        if emit:
+            yield (PUSH, start)
 
         found = False
 
         while open_set:
             # Pop the node that is estimated to be CLOSEST to the goal
             _, current = heapq.heappop(open_set)
-            
+
             nodes_explored += 1
+            if emit:
+                yield (EXPAND, divmod(current, n))
 
-            if current == goal:
+            if current == g:
                 found = True
                 break
 
-            x, y = current
-            for dx, dy in [(1,0), (-1,0), (0,1), (0,-1)]:
-                nx, ny = x + dx, y + dy
+            for nxt in neighbors[offsets[current]:offsets[current + 1]]:
+                if came_from[nxt] == -1:
+                    came_from[nxt] = current
 
-                # Check bounds and walls
-                if 0 <= nx < self.n and 0 <= ny < self.n and self.maze[nx][ny] == 0:
-                    if (nx, ny) not in visited:
-                        visited.add((nx, ny))
-                        came_from[(nx, ny)] = current
-                        
-                        # Calculate priority based ONLY on heuristic (Greedy)
-                        h_score = self.heuristic((nx, ny), goal)
-                        heapq.heappush(open_set, (h_score, (nx, ny)))
+                    # Calculate priority based ONLY on heuristic (Greedy)
+                    cell = divmod(nxt, n)
+                    h_score = self.heuristic(cell, goal)
+                    heapq.heappush(open_set, (h_score, nxt))
+                    if emit:
+                        yield (PUSH, cell)
 
         # Reconstruct path
         path = []
         if found:
-            cur = goal
-            while cur is not None:
-                path.append(cur)
-                cur = came_from[cur]
-            path.reverse()
-        
-        return path, nodes_explored
\ No newline at end of file
+            path = self.maze_obj.trace_path(came_from, s, g)
+            if emit:
+                yield (GOAL, path)
+
+        return path, nodes_explored
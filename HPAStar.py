@@ -0,0 +1,486 @@
+import heapq
+from array import array
+from collections import deque
+
+import numpy as np
+
+from Maze import label_components
+from SearchStats import SearchStats
+
+# Sources whose intra-cluster distances are computed together, one bit each in a uint16 mask
+SLOT_BITS = 16
+# Cells per batch of clusters in the vectorized distance pass (bounds memory on huge mazes)
+BATCH_CELLS = 1 << 20
+
+class HPAStar:
+    """
+    Hierarchical Pathfinding A* for very large mazes.
+
+    The maze is cut into cluster_size x cluster_size clusters. Where two
+    neighboring clusters touch, one transition (a pair of facing open cells)
+    is kept per border segment and per pair of connected regions it joins,
+    so every crossing the maze allows is still represented; long runs of
+    crossings get one every entrance_spacing cells (smaller = shorter paths,
+    larger = a smaller graph and faster queries). The entrance
+    cells of those transitions are the nodes of an abstract graph whose
+    edges are the transitions (cost 1) and the exact distances between
+    entrances of the same cluster, all precomputed once by build().
+
+    A query connects start and goal to the entrances of their own clusters,
+    runs A* on the abstract graph and refines only the cluster crossings on
+    the result into cells (refined segments are cached). Paths are
+    near-optimal: they are shortest among paths through the chosen transitions.
+    """
+
+    # What solve()'s nodes_explored counts (reported by SearchStats)
+    stats_unit = "cells attached + abstract nodes expanded"
+
+    def __init__(self, maze, cluster_size=32, entrance_spacing=8):
+        self.maze_obj = maze
+        self.n = maze.n
+        self.cluster_size = cluster_size
+        self.entrance_spacing = entrance_spacing
+        # maze.version the abstraction belongs to (None = not built yet)
+        self._version = None
+        # Refined intra-cluster segments: (from_cell, to_cell) -> cells after from_cell
+        self._segments = {}
+
+    # ----------------- Abstraction -----------------
+
+    def build(self):
+        """Precomputes the entrance nodes and the abstract graph for the current maze."""
+        n = self.n
+        cs = self.cluster_size
+        spacing = self.entrance_spacing
+        blocks = -(-n // cs)
+        padded = blocks * cs
+
+        # Walls pad the grid to whole clusters
+        is_open = np.zeros((padded, padded), dtype=bool)
+        is_open[:n, :n] = self.maze_obj.as_array() == 0
+        labels = label_components(is_open, block=cs)
+
+        # 1. Every open cell pair facing each other across a cluster border
+        borders = np.arange(cs, n, cs)
+        pair_a, pair_b, pair_key = [], [], []
+        for horizontal in (True, False):
+            if horizontal:
+                # Pair (border - 1, i) | (border, i)
+                k, i = np.nonzero(is_open[borders - 1, :] & is_open[borders, :])
+                a, b = (borders[k] - 1) * n + i, borders[k] * n + i
+            else:
+                # Pair (i, border - 1) | (i, border)
+                k, i = np.nonzero((is_open[:, borders - 1] & is_open[:, borders]).T)
+                a, b = i * n + borders[k] - 1, i * n + borders[k]
+            pair_a.append(a)
+            pair_b.append(b)
+            # Border segment: which border, which stretch of it, and its direction
+            pair_key.append((k * blocks + i // cs) * 2 + horizontal)
+        pair_a, pair_b, pair_key = (np.concatenate(x).astype(np.int64) for x in (pair_a, pair_b, pair_key))
+
+        # 2. Regions: connected open areas inside one cluster. A region whose only
+        # neighbor across the borders is one other region is a dead end; it is
+        # folded into that neighbor (repeatedly), so pockets never get entrances
+        region = labels[:n, :n].reshape(-1)
+        region_a, region_b = region[pair_a], region[pair_b]
+        group = self._absorb_leaves(int(labels.max()), region_a, region_b)
+
+        # 3. Transitions per border segment and pair of groups
+        group_a, group_b = group[region_a], group[region_b]
+        between = group_a != group_b
+        pair_a, pair_b = pair_a[between], pair_b[between]
+        keys = (pair_key[between], group_a[between], group_b[between])
+        order = np.lexsort((pair_a,) + keys[::-1])
+        pair_a, pair_b = pair_a[order], pair_b[order]
+        keys = [key[order] for key in keys]
+        first = np.zeros(pair_a.size, dtype=bool)
+        first[:1] = True
+        for key in keys:
+            first[1:] |= key[1:] != key[:-1]
+        # One transition per entrance_spacing candidates, in the middle of its stretch
+        group_id = np.cumsum(first) - 1
+        starts = np.flatnonzero(first)
+        count = np.diff(np.append(starts, pair_a.size))
+        p = np.arange(pair_a.size) - starts[group_id]
+        chunk_start = p - p % spacing
+        chunk_len = np.minimum(spacing, count[group_id] - chunk_start)
+        pick = np.flatnonzero(p - chunk_start == chunk_len // 2)
+        side_a, side_b = pair_a[pick], pair_b[pick]
+
+        nodes = np.unique(np.concatenate([side_a, side_b]))
+        a_node, b_node = np.searchsorted(nodes, side_a), np.searchsorted(nodes, side_b)
+
+        # Transitions cost one step, both ways
+        arc_src = [a_node, b_node]
+        arc_dst = [b_node, a_node]
+        arc_w = [np.ones(a_node.size, dtype=np.int64)] * 2
+
+        # 4. Entrances per cluster, numbered by slot
+        rows, cols = np.divmod(nodes, n)
+        cluster = (rows // cs) * blocks + cols // cs
+        by_cluster = np.argsort(cluster, kind="stable")
+        cluster_sorted = cluster[by_cluster]
+        cluster_offsets = np.searchsorted(cluster_sorted, np.arange(blocks * blocks + 1))
+        slot = np.empty(nodes.size, dtype=np.int64)
+        slot[by_cluster] = np.arange(nodes.size) - cluster_offsets[cluster_sorted]
+
+        # 5. Exact distances between entrances of the same cluster. Up to
+        # SLOT_BITS sources are flooded at once as bits of a uint16 mask
+        cluster_open = is_open.reshape(blocks, cs, blocks, cs).transpose(0, 2, 1, 3).reshape(-1, cs, cs)
+        local_r, local_c = rows % cs, cols % cs
+        max_slots = int(slot.max()) + 1 if nodes.size else 0
+        per_batch = max(1, BATCH_CELLS // (cs * cs))
+
+        for slot0 in range(0, max_slots, SLOT_BITS):
+            sources = np.flatnonzero((slot >= slot0) & (slot < slot0 + SLOT_BITS))
+            busy = np.unique(cluster[sources])
+            for b0 in range(0, busy.size, per_batch):
+                batch = busy[b0:b0 + per_batch]
+                src, dst, dist = self._flood(batch, cluster_open[batch], cluster, slot - slot0,
+                                             local_r, local_c, sources)
+                arc_src.append(src)
+                arc_dst.append(dst)
+                arc_w.append(dist)
+
+        # 6. Abstract graph in CSR form
+        src = np.concatenate(arc_src)
+        dst = np.concatenate(arc_dst)
+        w = np.concatenate(arc_w)
+        order = np.argsort(src, kind="stable")
+        offsets = np.zeros(nodes.size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=nodes.size), out=offsets[1:])
+
+        self._set_graph(nodes, offsets, dst[order], w[order], region, group)
+
+    @staticmethod
+    def _absorb_leaves(regions, region_a, region_b):
+        """
+        Folds dead-end regions into their only neighbor, like peeling leaves off
+        the region graph. Returns group[region] = the region it was folded into
+        (itself if it kept two or more neighbors), as a NumPy array.
+        """
+        neighbors = [set() for _ in range(regions + 1)]
+        for a, b in zip(region_a.tolist(), region_b.tolist()):
+            neighbors[a].add(b)
+            neighbors[b].add(a)
+
+        group = list(range(regions + 1))
+        leaves = [r for r in range(1, regions + 1) if len(neighbors[r]) == 1]
+        while leaves:
+            r = leaves.pop()
+            if len(neighbors[r]) != 1:
+                continue
+            host = neighbors[r].pop()
+            group[r] = host
+            neighbors[host].discard(r)
+            if len(neighbors[host]) == 1:
+                leaves.append(host)
+
+        # Follow fold chains to the final host
+        for r in range(regions + 1):
+            host = r
+            while group[host] != host:
+                host = group[host]
+            group[r] = host
+        return np.asarray(group, dtype=np.int64)
+
+    def _set_graph(self, nodes, arc_offsets, arc_target, arc_weight, region, group):
+        # array() copies index as plain ints, much cheaper than NumPy scalars in the query loop
+        self.nodes = array('q', np.asarray(nodes, dtype=np.int64).tobytes())
+        self.arc_offsets = array('q', np.asarray(arc_offsets, dtype=np.int64).tobytes())
+        self.arc_target = array('q', np.asarray(arc_target, dtype=np.int64).tobytes())
+        self.arc_weight = array('q', np.asarray(arc_weight, dtype=np.int64).tobytes())
+        # Per-cell region label and per-region group (see build), for attaching queries
+        self.region = array('i', np.asarray(region, dtype=np.int32).tobytes())
+        self.group = array('i', np.asarray(group, dtype=np.int32).tobytes())
+        self._node_of = {cell: i for i, cell in enumerate(self.nodes)}
+        self._version = self.maze_obj.version
+        self._segments = {}
+
+    def _ensure_built(self):
+        if self._version != self.maze_obj.version:
+            self.build()
+
+    def clear_cache(self):
+        """Drops the abstraction and the refined segments; the next query rebuilds them."""
+        self._version = None
+        self._segments = {}
+
+    # ----------------- Persistence -----------------
+
+    def save(self, path):
+        """Writes the abstraction to an .npz file, tagged with the maze fingerprint."""
+        self._ensure_built()
+        with open(path, "wb") as f:
+            np.savez(f, fingerprint=self.maze_obj.fingerprint(), cluster_size=self.cluster_size,
+                     entrance_spacing=self.entrance_spacing,
+                     nodes=np.asarray(self.nodes), arc_offsets=np.asarray(self.arc_offsets),
+                     arc_target=np.asarray(self.arc_target), arc_weight=np.asarray(self.arc_weight),
+                     region=np.asarray(self.region), group=np.asarray(self.group))
+
+    @classmethod
+    def load(cls, path, maze):
+        """Rebuilds a planner for `maze` from save() output, skipping build()."""
+        with np.load(path) as data:
+            if str(data["fingerprint"]) != maze.fingerprint():
+                raise ValueError(f"{path} was built for a different maze")
+            planner = cls(maze, cluster_size=int(data["cluster_size"]),
+                          entrance_spacing=int(data["entrance_spacing"]))
+            planner._set_graph(data["nodes"], data["arc_offsets"], data["arc_target"],
+                               data["arc_weight"], data["region"], data["group"])
+        return planner
+
+    def _flood(self, batch, open_cells, cluster, bit, local_r, local_c, sources):
+        """
+        Bit-parallel BFS inside one batch of clusters. Each source entrance sets
+        its slot bit at its cell; one shifted OR per direction advances all of
+        them a level. Returns (src_node, dst_node, distance) for every pair of
+        entrances connected inside a cluster.
+        """
+        cs = self.cluster_size
+        pos = np.searchsorted(batch, cluster)
+        in_batch = (pos < batch.size) & (batch[np.minimum(pos, batch.size - 1)] == cluster)
+
+        # Seeds, and which node owns each (cluster position, bit)
+        seeds = sources[np.isin(cluster[sources], batch)]
+        frontier = np.zeros((batch.size, cs, cs), dtype=np.uint16)
+        np.bitwise_or.at(frontier, (pos[seeds], local_r[seeds], local_c[seeds]),
+                         (1 << bit[seeds]).astype(np.uint16))
+        owner = np.full((batch.size, SLOT_BITS), -1, dtype=np.int64)
+        owner[pos[seeds], bit[seeds]] = seeds
+
+        # Every entrance of these clusters is a target
+        targets = np.flatnonzero(in_batch)
+        t_pos, t_r, t_c = pos[targets], local_r[targets], local_c[targets]
+        dist = np.full((targets.size, SLOT_BITS), -1, dtype=np.int64)
+
+        open_mask = np.where(open_cells, np.uint16(0xFFFF), np.uint16(0))
+        visited = frontier.copy()
+        level = 0
+        hits = frontier[t_pos, t_r, t_c]
+        while True:
+            for b in range(SLOT_BITS):
+                dist[(hits >> b) & 1 == 1, b] = level
+            level += 1
+            spread = np.zeros_like(frontier)
+            spread[:, 1:, :] |= frontier[:, :-1, :]
+            spread[:, :-1, :] |= frontier[:, 1:, :]
+            spread[:, :, 1:] |= frontier[:, :, :-1]
+            spread[:, :, :-1] |= frontier[:, :, 1:]
+            frontier = spread & ~visited & open_mask
+            if not frontier.any():
+                break
+            visited |= frontier
+            hits = frontier[t_pos, t_r, t_c]
+
+        t, b = np.nonzero(dist >= 0)
+        src = owner[t_pos[t], b]
+        dst = targets[t]
+        keep = src != dst
+        return src[keep], dst[keep], dist[t, b][keep]
+
+    # ----------------- Queries -----------------
+
+    def _cluster_of(self, cell):
+        r, c = divmod(cell, self.n)
+        cs = self.cluster_size
+        return (r // cs) * (-(-self.n // cs)) + c // cs
+
+    def _local_bfs(self, src, stop=None):
+        """
+        BFS from src that never leaves src's cluster. Returns (dist, parent)
+        dicts keyed by cell id; stops early once `stop` is reached.
+        """
+        n = self.n
+        cs = self.cluster_size
+        r, c = divmod(src, n)
+        r0, c0 = r - r % cs, c - c % cs
+        r1, c1 = min(r0 + cs, n), min(c0 + cs, n)
+        open_neighbors = self.maze_obj.open_neighbors
+
+        dist = {src: 0}
+        parent = {src: src}
+        queue = deque([src])
+        while queue:
+            current = queue.popleft()
+            if current == stop:
+                break
+            step = dist[current] + 1
+            for nxt in open_neighbors(current):
+                if nxt not in dist:
+                    nr, nc = divmod(nxt, n)
+                    if r0 <= nr < r1 and c0 <= nc < c1:
+                        dist[nxt] = step
+                        parent[nxt] = current
+                        queue.append(nxt)
+        return dist, parent
+
+    def _group_bfs(self, src, stop=None):
+        """
+        BFS from src over the cells of src's group: its region plus every
+        dead-end region folded into the same host. Returns (dist, parent) dicts.
+        """
+        region, group = self.region, self.group
+        home = group[region[src]]
+        open_neighbors = self.maze_obj.open_neighbors
+
+        dist = {src: 0}
+        parent = {src: src}
+        queue = deque([src])
+        while queue:
+            current = queue.popleft()
+            if current == stop:
+                break
+            step = dist[current] + 1
+            for nxt in open_neighbors(current):
+                if nxt not in dist and group[region[nxt]] == home:
+                    dist[nxt] = step
+                    parent[nxt] = current
+                    queue.append(nxt)
+        return dist, parent
+
+    def _attach(self, cell):
+        """
+        Distances from cell to the entrances it can use: a BFS inside its own
+        cluster, or over its group when cell lies in a folded dead-end region.
+        """
+        r = self.region[cell]
+        if self.group[r] == r:
+            return self._local_bfs(cell)
+        return self._group_bfs(cell)
+
+    def _segment(self, u, v):
+        """Cells after u on a shortest path u -> v inside their shared cluster (cached)."""
+        key = (u, v)
+        cells = self._segments.get(key)
+        if cells is None:
+            _, parent = self._local_bfs(u, stop=v)
+            cells = []
+            cur = v
+            while cur != u:
+                cells.append(cur)
+                cur = parent[cur]
+            cells.reverse()
+            self._segments[key] = cells
+        return cells
+
+    def solve(self, start=(0, 0), goal=None, stats=False):
+        # Opt-in instrumentation: returns (path, nodes_explored, SearchStats). Runs the query
+        # up to three times: a timed solve(), an events() pass for the counters and a
+        # traced solve() for memory (see SearchStats.measure)
+        if stats:
+            return SearchStats.measure(self, start, goal)
+
+        if goal is None:
+            goal = (self.n - 1, self.n - 1)
+
+        # Start and goal in different connected components: nothing to search
+        if not self.maze_obj.reachable(start, goal):
+            return [], 0
+
+        self._ensure_built()
+        n = self.n
+        s = self.maze_obj.index(start)
+        g = self.maze_obj.index(goal)
+        if s == g:
+            return [start], 1
+
+        # Hook start and goal onto the entrances around them
+        s_dist, s_parent = self._attach(s)
+        g_dist, g_parent = self._attach(g)
+        nodes_explored = len(s_dist) + len(g_dist)
+
+        N = len(self.nodes)
+        START, GOAL = N, N + 1
+        node_of, nodes = self._node_of, self.nodes
+        offsets, target, weight = self.arc_offsets, self.arc_target, self.arc_weight
+
+        start_arcs = [(node_of[cell], d) for cell, d in s_dist.items() if cell in node_of]
+        # Entrance -> GOAL arcs
+        goal_arcs = {node_of[cell]: d for cell, d in g_dist.items() if cell in node_of}
+
+        # Same group: the walk that never uses an entrance is a candidate too
+        direct_parent = None
+        if self.group[self.region[s]] == self.group[self.region[g]]:
+            direct_dist, direct_parent = self._group_bfs(s, stop=g)
+            nodes_explored += len(direct_dist)
+            if g in direct_dist:
+                start_arcs.append((GOAL, direct_dist[g]))
+
+        gr, gc = goal
+
+        def h(node):
+            if node >= N:
+                return 0
+            r, c = divmod(nodes[node], n)
+            return abs(r - gr) + abs(c - gc)
+
+        # A* on the abstract graph. Entries are (f, -g, node) like AStarSearch
+        g_score = {START: 0}
+        came_from = {}
+        closed = set()
+        open_set = [(h(START), 0, START)]
+
+        while open_set:
+            _, _, current = heapq.heappop(open_set)
+            if current in closed:
+                continue
+            closed.add(current)
+            nodes_explored += 1
+            if current == GOAL:
+                break
+
+            base = g_score[current]
+            if current == START:
+                arcs = start_arcs
+            else:
+                arcs = [(target[i], weight[i]) for i in range(offsets[current], offsets[current + 1])]
+                if current in goal_arcs:
+                    arcs.append((GOAL, goal_arcs[current]))
+
+            for nxt, w in arcs:
+                tentative_g = base + w
+                if tentative_g < g_score.get(nxt, tentative_g + 1):
+                    g_score[nxt] = tentative_g
+                    came_from[nxt] = current
+                    heapq.heappush(open_set, (tentative_g + h(nxt), -tentative_g, nxt))
+
+        if GOAL not in closed:
+            return [], nodes_explored
+
+        # Refine: abstract hops back into cells
+        hops = [GOAL]
+        while hops[-1] != START:
+            hops.append(came_from[hops[-1]])
+        hops.reverse()
+
+        cells = [s]
+        for u, v in zip(hops, hops[1:]):
+            if u == START and v == GOAL:
+                piece = []
+                cur = g
+                while cur != s:
+                    piece.append(cur)
+                    cur = direct_parent[cur]
+                cells.extend(reversed(piece))
+            elif u == START:
+                # s_parent points back towards s
+                piece = []
+                cur = nodes[v]
+                while cur != s:
+                    piece.append(cur)
+                    cur = s_parent[cur]
+                cells.extend(reversed(piece))
+            elif v == GOAL:
+                # g_parent points on towards g
+                cur = nodes[u]
+                while cur != g:
+                    cur = g_parent[cur]
+                    cells.append(cur)
+            elif self._cluster_of(nodes[u]) != self._cluster_of(nodes[v]):
+                # A transition: one step across the border
+                cells.append(nodes[v])
+            else:
+                cells.extend(self._segment(nodes[u], nodes[v]))
+
+        return [divmod(cell, n) for cell in cells], nodes_explored
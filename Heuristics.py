@@ -0,0 +1,79 @@
+import math
+
+import numpy as np
+
+# Each heuristic is written once per form, all on absolute offsets dx, dy:
+#   scalar     - plain Python numbers (used per pushed node)
+#   vectorized - NumPy arrays (used for whole populations / whole grids)
+# Unknown names (including "none") behave like Dijkstra: h = 0.
+
+def _manhattan(dx, dy):
+    # Best for 4-direction grids (Up, Down, Left, Right)
+    return dx + dy
+
+def _euclidean(dx, dy):
+    # Shortest line distance (Good if diagonal movement was allowed)
+    return math.sqrt(dx * dx + dy * dy)
+
+def _chebyshev(dx, dy):
+    # Also known as Diagonal distance (Max of dx, dy)
+    return dx if dx > dy else dy
+
+def _zero(dx, dy):
+    return 0
+
+SCALAR = {
+    "manhattan": _manhattan,
+    "euclidean": _euclidean,
+    "chebyshev": _chebyshev,
+}
+
+VECTORIZED = {
+    "manhattan": lambda dx, dy: dx + dy,
+    "euclidean": lambda dx, dy: np.sqrt(dx ** 2 + dy ** 2),
+    "chebyshev": np.maximum,
+}
+
+def get_heuristic(name):
+    """Returns h(a, b) on (row, col) tuples for the given heuristic name."""
+    dist = SCALAR.get(name.lower(), _zero)
+
+    def h(a, b):
+        return dist(abs(a[0] - b[0]), abs(a[1] - b[1]))
+    return h
+
+def get_vectorized(name):
+    """Returns h(dx, dy) on NumPy arrays of absolute offsets."""
+    return VECTORIZED.get(name.lower(), lambda dx, dy: np.zeros_like(dx))
+
+def flat_heuristic(name, n, goal):
+    """
+    Returns h(idx) on flat cell ids (idx = r * n + c) with the goal bound in,
+    so the search loop pays neither the string dispatch nor a divmod tuple.
+    """
+    name = name.lower()
+    gr, gc = goal
+    if name == "manhattan":
+        def h(idx):
+            r, c = divmod(idx, n)
+            return abs(r - gr) + abs(c - gc)
+    elif name in SCALAR:
+        dist = SCALAR[name]
+        def h(idx):
+            r, c = divmod(idx, n)
+            return dist(abs(r - gr), abs(c - gc))
+    else:
+        def h(idx):
+            return 0
+    return h
+
+def heuristic_table(name, n, goal):
+    """
+    h for every cell towards a fixed goal, as a flat NumPy array of n * n values
+    (int64 for manhattan/chebyshev/none, float64 for euclidean).
+    """
+    rows = np.arange(n, dtype=np.int64)
+    dx = np.abs(rows - goal[0])[:, None]
+    dy = np.abs(rows - goal[1])[None, :]
+    dx, dy = np.broadcast_arrays(dx, dy)
+    return np.ascontiguousarray(get_vectorized(name)(dx, dy)).reshape(-1)
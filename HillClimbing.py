@@ -1,52 +1,86 @@
+from SearchEvents import PUSH, EXPAND, GOAL, run_search
+from SearchStats import SearchStats
+
 class HillClimbing:
     def __init__(self, maze):
-        self.maze = maze.grid
+        self.maze_obj = maze
         self.n = maze.n
 
     def heuristic(self, a, b):
         """Manhattan distance heuristic."""
         return abs(a[0] - b[0]) + abs(a[1] - b[1])
 
-    def solve(self, start=(0, 0), goal=None):
+    def solve(self, start=(0, 0), goal=None, stats=False):
+        # Opt-in instrumentation: returns (path, nodes_explored, SearchStats). Runs the query
+        # up to three times: a timed solve(), an events() pass for the counters and a
+        # traced solve() for memory (see SearchStats.measure)
+        if stats:
+            return SearchStats.measure(self, start, goal)
+
+        if goal is None:
+            goal = (self.n - 1, self.n - 1)
+
+        # Start and goal in different connected components: nothing to search
+        if not self.maze_obj.reachable(start, goal):
+            return [], 0
+
+        return run_search(self._search(start, goal))
+
+    def events(self, start=(0, 0), goal=None):
+        """
+        solve() as a lazy stream of (kind, cell) events (see SearchEvents):
+        every step expands the current cell and pushes the neighbor it moves to.
+        """
         if goal is None:
             goal = (self.n - 1, self.n - 1)
+        if not self.maze_obj.reachable(start, goal):
+            return
+        yield from self._search(start, goal, emit=True)
+
+    def _search(self, start, goal, emit=False):
+        """The climb behind solve() and events(); yields events only with emit."""
+        # Hill climbing touches only its own path, so neighbors are read straight
+        # from the cells instead of building the full neighbor table
+        open_neighbors = self.maze_obj.open_neighbors
+        n = self.n
+        g = self.maze_obj.index(goal)
 
-        current = start
-        path = [current]
-        visited = set([current])
+        current = self.maze_obj.index(start)
+        path = [start]
+        # A set, not an n*n array: hill climbing only ever touches its own path
+        visited = {current}
         nodes_explored = 0
+        if emit:
+            yield (PUSH, start)
 
-        while current != goal:
+        while current != g:
             nodes_explored += 1
-            x, y = current
-            
-            # 1. Gather all valid neighbors and their heuristic scores
-            neighbors = []
-            for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
-                nx, ny = x + dx, y + dy
-                
-                # Check bounds, walls, and if we've already visited it
-                if (0 <= nx < self.n and 
-                    0 <= ny < self.n and 
-                    self.maze[nx][ny] == 0 and 
-                    (nx, ny) not in visited):
-                    
-                    h_score = self.heuristic((nx, ny), goal)
-                    neighbors.append(((nx, ny), h_score))
+            if emit:
+                yield (EXPAND, divmod(current, n))
+
+            # 1. Gather all valid (unvisited) neighbors and their heuristic scores
+            best_neighbor = -1
+            best_score = None
+            for nxt in open_neighbors(current):
+                if nxt not in visited:
+                    h_score = self.heuristic(divmod(nxt, n), goal)
+                    # Strict '<' keeps the first of equally good neighbors,
+                    # matching a stable sort over DIRECTIONS order
+                    if best_score is None or h_score < best_score:
+                        best_neighbor, best_score = nxt, h_score
 
             # 2. If no valid neighbors exist, we are stuck (Local Maximum / Dead End)
-            if not neighbors:
+            if best_neighbor == -1:
                 return [], nodes_explored  # Failed to find path
 
-            # 3. Sort neighbors by heuristic (lowest distance is best)
+            # 3. Move to the best neighbor
             # This is the "Greedy" part: always pick the best immediate move
-            neighbors.sort(key=lambda x: x[1])
-
-            # 4. Move to the best neighbor
-            best_neighbor = neighbors[0][0]
-            
             current = best_neighbor
             visited.add(current)
-            path.append(current)
+            path.append(divmod(current, n))
+            if emit:
+                yield (PUSH, path[-1])
 
-        return path, nodes_explored
\ No newline at end of file
+        if emit:
+            yield (GOAL, path)
+        return path, nodes_explored
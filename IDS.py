@@ -1,70 +1,186 @@
+from array import array
+
+from SearchEvents import PUSH, EXPAND, STALE, GOAL, run_search
+from SearchStats import SearchStats
+
 class IDS:
-    def __init__(self, maze):
-        self.maze = maze.grid
+    def __init__(self, maze, reuse_depths=False):
+        self.maze_obj = maze
         self.n = maze.n
+        # When True, depth information is carried from one iteration to the next:
+        # each deepening step resumes from the nodes cut off at the previous limit
+        # instead of re-expanding every shallower layer again (see _solve_with_reuse)
+        self.reuse_depths = reuse_depths
+        # Depth-limited passes share one set of n*n buffers (see _dls), allocated
+        # on first use and reused by every later pass and query
+        self._buffers = None
+        # Pass counter stamped into the visited table, so it never needs clearing
+        self._stamp = 0
+
+    def clear_cache(self):
+        """Drops the search buffers, so the next query allocates them again."""
+        self._buffers = None
 
-    def solve(self, start=(0, 0), goal=None):
+    def solve(self, start=(0, 0), goal=None, stats=False):
         """
         Main IDS loop: increases depth limit until goal is found or max depth reached.
         """
+        # Opt-in instrumentation: returns (path, nodes_explored, SearchStats). Runs the query
+        # up to three times: a timed solve(), an events() pass for the counters and a
+        # traced solve() for memory (see SearchStats.measure)
+        if stats:
+            return SearchStats.measure(self, start, goal)
+
+        if goal is None:
+            goal = (self.n - 1, self.n - 1)
+
+        # Start and goal in different connected components: nothing to search
+        if not self.maze_obj.reachable(start, goal):
+            return [], 0
+
+        s = self.maze_obj.index(start)
+        g = self.maze_obj.index(goal)
+
+        if self.reuse_depths:
+            return self._solve_with_reuse(s, g)
+
+        return run_search(self._search(s, g))
+
+    def events(self, start=(0, 0), goal=None):
+        """
+        The plain (reuse_depths=False) solve() as a lazy stream of (kind, cell)
+        events (see SearchEvents). Every iteration starts over from the start
+        cell, so a cell is expanded again at each deeper limit.
+        """
         if goal is None:
             goal = (self.n - 1, self.n - 1)
+        if not self.maze_obj.reachable(start, goal):
+            return
+        yield from self._search(self.maze_obj.index(start), self.maze_obj.index(goal), emit=True)
 
+    def _search(self, start, goal, emit=False):
+        """
+        The deepening loop behind solve() and events() on flat ids; yields
+        events only with emit, and returns (path, nodes_explored).
+        """
         total_nodes_explored = 0
-        depth_limit = 0
-        
-        # Safety break: Max depth theoretically needed is total cells (N*N)
-        max_limit = self.n * self.n
 
-        while depth_limit <= max_limit:
+        # The deepest a shortest path can be is total cells - 1
+        for depth_limit in range(self.n * self.n):
             # Run DLS for the current depth limit
-            found_path, count = self._dls(start, goal, depth_limit)
-            
+            found_path, count = yield from self._dls(start, goal, depth_limit, emit)
+
             total_nodes_explored += count
 
             if found_path:
-                return found_path, total_nodes_explored
-            
-            depth_limit += 1
+                path = [divmod(idx, self.n) for idx in found_path]
+                if emit:
+                    yield (GOAL, path)
+                return path, total_nodes_explored
 
         return [], total_nodes_explored
 
-    def _dls(self, start, goal, limit):
+    def _dls(self, start, goal, limit, emit=False):
         """
-        Performs Depth-Limited Search (Iterative approach).
-        Returns: (path_list, nodes_explored_count)
+        Depth-Limited Search on flat cell ids, as a generator that yields
+        events only with emit. Stack entries are bare cells with their depth;
+        the branch being explored lives in one path buffer indexed by depth,
+        so nothing is copied per push and the path is read off at the goal.
+        Returns: (path_list_of_ids or None, nodes_explored_count)
         """
-        # Stack stores tuples: (current_node, path_so_far)
-        stack = [(start, [start])]
-        nodes_explored = 0
-        
+        offsets, neighbors = self.maze_obj.adjacency()
+        n = self.n
+        if self._buffers is None:
+            size = n * n
+            # path[d]: cell at depth d of the current branch; seen_at / best_depth:
+            # the per-cell visited table of a pass; then the stack (cells, depths)
+            self._buffers = (array('i', bytes(4 * size)), array('q', bytes(8 * size)),
+                             array('i', bytes(4 * size)), [], [])
+        path, seen_at, best_depth, stack, depths = self._buffers
+        self._stamp += 1
+        stamp = self._stamp
+
         # To handle cycles efficiently in DLS: track the best depth we've seen a node
-        # If we reach a node again at a deeper/same level in the SAME iteration, skip it.
-        visited_depths = {start: 0}
+        # If we reach a node again at a deeper/same level in the SAME pass, skip it.
+        seen_at[start] = stamp
+        best_depth[start] = 0
+        del stack[:], depths[:]
+        stack.append(start)
+        depths.append(0)
+        nodes_explored = 0
+        if emit:
+            yield (PUSH, divmod(start, n))
 
         while stack:
-            current, path = stack.pop()
+            current = stack.pop()
+            depth = depths.pop()
+            if best_depth[current] != depth:
+                # Pushed again from a shallower branch since; that entry covers it
+                if emit:
+                    yield (STALE, divmod(current, n))
+                continue
+
+            # Entries above this one on the stack all came from deeper in the
+            # branch, so path[:depth] still holds this cell's ancestors
+            path[depth] = current
             nodes_explored += 1
-            
+            if emit:
+                yield (EXPAND, divmod(current, n))
+
             if current == goal:
-                return path, nodes_explored
-            
+                return path[:depth + 1].tolist(), nodes_explored
+
             # If we reached the limit, do not expand further
-            if len(path) - 1 >= limit:
+            if depth >= limit:
                 continue
 
-            x, y = current
-            # Explore neighbors
-            for dx, dy in [(1,0), (-1,0), (0,1), (0,-1)]:
-                nx, ny = x + dx, y + dy
-
-                if 0 <= nx < self.n and 0 <= ny < self.n and self.maze[nx][ny] == 0:
-                    new_depth = len(path) # Path length is current_depth + 1
-                    
-                    # Optimization: Only push if we haven't visited this node 
-                    # at a shallower depth in this specific DLS run.
-                    if (nx, ny) not in visited_depths or new_depth < visited_depths[(nx, ny)]:
-                        visited_depths[(nx, ny)] = new_depth
-                        stack.append(((nx, ny), path + [(nx, ny)]))
-        
-        return None, nodes_explored
\ No newline at end of file
+            new_depth = depth + 1
+            for nxt in neighbors[offsets[current]:offsets[current + 1]]:
+                if seen_at[nxt] != stamp or new_depth < best_depth[nxt]:
+                    seen_at[nxt] = stamp
+                    best_depth[nxt] = new_depth
+                    stack.append(nxt)
+                    depths.append(new_depth)
+                    if emit:
+                        yield (PUSH, divmod(nxt, n))
+
+        return None, nodes_explored
+
+    def _solve_with_reuse(self, start, goal):
+        """
+        IDS with a depth table kept across iterations. Every cell's depth and
+        parent are recorded the first time it is reached; the nodes cut off at
+        the previous limit become the roots of the next iteration, so each
+        cell is expanded once over the whole search. Nothing is re-expanded,
+        which also means nothing is deepened depth-first any more: this is a
+        layer-by-layer BFS (depth-first order within a layer) and needs the
+        n*n parent table BFS does. Paths are shortest.
+        """
+        offsets, neighbors = self.maze_obj.adjacency()
+        size = self.n * self.n
+
+        # parent[i] == -1 means "depth not known yet"; start is its own parent
+        parent = array('i', [-1]) * size
+        parent[start] = start
+        frontier = [start]
+        total_nodes_explored = 0
+
+        while frontier:
+            # One deepening step: expand the cut-off nodes (depth-first order)
+            cut_off = []
+            while frontier:
+                current = frontier.pop()
+                total_nodes_explored += 1
+
+                if current == goal:
+                    return self.maze_obj.trace_path(parent, start, goal), total_nodes_explored
+
+                for nxt in neighbors[offsets[current]:offsets[current + 1]]:
+                    if parent[nxt] == -1:
+                        parent[nxt] = current
+                        cut_off.append(nxt)
+
+            # cut_off is reversed so the next iteration pops in push order
+            frontier = cut_off[::-1]
+
+        return [], total_nodes_explored
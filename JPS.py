@@ -0,0 +1,219 @@
+import heapq
+
+from JumpTables import ROW_BLOCK
+from SearchEvents import PUSH, EXPAND, STALE, GOAL, run_search
+from SearchStats import SearchStats
+
+# Directions tried from a jump point: all four from the start, otherwise the
+# two turns and straight on (vertical first, so symmetric paths are pruned)
+START_DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+TURNS = {
+    (0, 1): ((1, 0), (-1, 0), (0, 1)),
+    (0, -1): ((1, 0), (-1, 0), (0, -1)),
+    (1, 0): ((0, 1), (0, -1), (1, 0)),
+    (-1, 0): ((0, 1), (0, -1), (-1, 0)),
+}
+
+class JPS:
+    """
+    Jump Point Search for a 4-connected, uniform-cost grid (weighted mazes
+    raise ValueError; use UCS or AStarSearch there).
+    Instead of pushing every neighbor, A* only pushes "jump points": cells
+    reached by scanning in a straight line until something forces a turn.
+    Vertical moves are tried before horizontal ones, so symmetric paths
+    are pruned without losing optimality.
+    """
+
+    def __init__(self, maze):
+        self.maze_obj = maze
+        self.n = maze.n
+        # Flat byte grid (1 = wall) scanned by the jump functions
+        self.cells = maze.cells
+        # Scan-table lookup of the maze's JumpTables, bound by solve()
+        self._row_table = None
+
+    def _check_unit_costs(self):
+        # Jumps skip over cells, so terrain costs would be silently ignored
+        if self.maze_obj.weighted:
+            raise ValueError("JPS needs unit step costs; use UCS or AStarSearch on weighted mazes")
+
+    def heuristic(self, a, b):
+        """Manhattan distance (exact on an empty 4-connected grid)."""
+        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+    def _jump_horizontal(self, r, c, dc, goal):
+        """Jumps along a row from (r, c); returns the first jump point or None (one table lookup)."""
+        if not 0 <= c < self.n:
+            return None
+        offset, is_open, right, left, _, _ = self._row_table(r)
+        if not is_open[offset + c]:
+            return None
+        if dc > 0:
+            stop = right[offset + c]
+            # The goal comes before the stop: every cell up to it is open
+            if goal[0] == r and c <= goal[1] <= stop:
+                return goal
+            if stop < self.n and is_open[offset + stop]:
+                return (r, stop)
+        else:
+            stop = left[offset + c]
+            if goal[0] == r and stop <= goal[1] <= c:
+                return goal
+            if stop >= 0 and is_open[offset + stop]:
+                return (r, stop)
+        return None
+
+    def _jump_vertical(self, r, c, dr, goal):
+        """Jumps along a column from (r, c); returns the first jump point or None (one lookup per block)."""
+        n = self.n
+        goal_row, goal_col = goal
+        while 0 <= r < n:
+            offset, is_open, _, _, down, up = self._row_table(r)
+            stop = (down if dr > 0 else up)[offset + c]
+
+            # Rows passed before the stop are open; a horizontal branch from the
+            # goal's row reaches the goal, or the goal is in this column
+            if min(r, stop) <= goal_row <= max(r, stop) and goal_row != stop:
+                if goal_col == c:
+                    return goal
+                dc = 1 if goal_col > c else -1
+                if self._jump_horizontal(goal_row, c + dc, dc, goal) == goal:
+                    return (goal_row, c)
+
+            block_top = r - offset // n
+            if block_top <= stop < block_top + ROW_BLOCK and stop < n:
+                # A wall, or a cell where the scan stops (the goal row check is above)
+                stop_offset, stop_open = self._row_table(stop)[:2]
+                return (stop, c) if stop_open[stop_offset + c] else None
+            # Nothing in this block: carry on in the next one
+            r = stop
+
+        return None
+
+    def _successors(self, node, parent, goal):
+        """Yields the jump points reachable from `node` given the direction it was entered from."""
+        r, c = node
+        if parent is None:
+            directions = START_DIRECTIONS
+        else:
+            # Normalized travel direction (jump points are always in a straight line)
+            directions = TURNS[((r > parent[0]) - (r < parent[0]), (c > parent[1]) - (c < parent[1]))]
+
+        for dr, dc in directions:
+            if dr:
+                jump_point = self._jump_vertical(r + dr, c, dr, goal)
+            else:
+                jump_point = self._jump_horizontal(r, c + dc, dc, goal)
+            if jump_point is not None:
+                yield jump_point
+
+    def solve(self, start=(0, 0), goal=None, stats=False):
+        # Opt-in instrumentation: returns (path, nodes_explored, SearchStats). Runs the query
+        # up to three times: a timed solve(), an events() pass for the counters and a
+        # traced solve() for memory (see SearchStats.measure)
+        if stats:
+            return SearchStats.measure(self, start, goal)
+
+        self._check_unit_costs()
+        if goal is None:
+            goal = (self.n - 1, self.n - 1)
+
+        # Start and goal in different connected components: nothing to search
+        if not self.maze_obj.reachable(start, goal):
+            return [], 0
+
+        return run_search(self._search(start, goal))
+
+    def events(self, start=(0, 0), goal=None):
+        """
+        solve() as a lazy stream of (kind, cell) events (see SearchEvents);
+        only jump points are pushed and expanded.
+        """
+        self._check_unit_costs()
+        if goal is None:
+            goal = (self.n - 1, self.n - 1)
+        if not self.maze_obj.reachable(start, goal):
+            return
+        yield from self._search(start, goal, emit=True)
+
+    def _search(self, start, goal, emit=False):
+        """The jump point search behind solve() and events(); yields events only with emit."""
+        n = self.n
+        s = self.maze_obj.index(start)
+        g = self.maze_obj.index(goal)
+        self._row_table = self.maze_obj.jump_tables().row
+
+        # Entries are (f, -g, cell_id) for jump points only; as in AStarSearch,
+        # equal f is broken towards larger g (closer to the goal)
+        open_set = [(self.heuristic(start, goal), 0, s)]
+        heappush, heappop = heapq.heappush, heapq.heappop
+        goal_r, goal_c = goal
+        # Only jump points get state, so it is kept sparse (dicts keyed by cell id)
+        # rather than in n*n arrays; this keeps huge memory-mapped mazes cheap
+        came_from = {s: s}
+        g_score = {s: 0}
+
+        nodes_explored = 0
+        closed = set()
+        found = False
+        if emit:
+            yield (PUSH, start)
+
+        while open_set:
+            _, _, current = heappop(open_set)
+
+            if current in closed:
+                if emit:
+                    yield (STALE, divmod(current, n))
+                continue
+            closed.add(current)
+            nodes_explored += 1
+            node = r, c = divmod(current, n)
+            if emit:
+                yield (EXPAND, node)
+
+            if current == g:
+                found = True
+                break
+
+            parent = None if current == s else divmod(came_from[current], n)
+            g_current = g_score[current]
+            for jump_point in self._successors(node, parent, goal):
+                jr, jc = jump_point
+                nxt = jr * n + jc
+                # Jump points lie on a straight line, so the step cost is their
+                # Manhattan distance (the heuristic, inlined on the hot path)
+                tentative_g = g_current + abs(jr - r) + abs(jc - c)
+                known = g_score.get(nxt)
+                if known is None or tentative_g < known:
+                    came_from[nxt] = current
+                    g_score[nxt] = tentative_g
+                    f = tentative_g + abs(jr - goal_r) + abs(jc - goal_c)
+                    heappush(open_set, (f, -tentative_g, nxt))
+                    if emit:
+                        yield (PUSH, jump_point)
+
+        if not found:
+            return [], nodes_explored
+        path = self._expand_path(came_from, s, g)
+        if emit:
+            yield (GOAL, path)
+        return path, nodes_explored
+
+    def _expand_path(self, came_from, s, g):
+        """Expands the jump points from s to g back into the full cell-by-cell path."""
+        n = self.n
+        jump_points = [g]
+        while jump_points[-1] != s:
+            jump_points.append(came_from[jump_points[-1]])
+        jump_points.reverse()
+
+        path = [divmod(s, n)]
+        for r1, c1 in (divmod(idx, n) for idx in jump_points[1:]):
+            r0, c0 = path[-1]
+            dr = (r1 > r0) - (r1 < r0)
+            dc = (c1 > c0) - (c1 < c0)
+            while (r0, c0) != (r1, c1):
+                r0, c0 = r0 + dr, c0 + dc
+                path.append((r0, c0))
+        return path
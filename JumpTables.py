@@ -0,0 +1,83 @@
+from array import array
+
+import numpy as np
+
+# Rows per block of scan tables
+ROW_BLOCK = 64
+
+class JumpTables:
+    """
+    Precomputed straight-line scans for Jump Point Search (JPS) on the
+    4-connected grid: for every cell, where a scan in each of the four
+    directions stops (a wall or a jump point), so a jump is one lookup
+    instead of a cell-by-cell walk. Blocks of ROW_BLOCK rows are built on
+    first use, so huge memory-mapped mazes only pay for the rows searched.
+
+    Shared by every JPS on the same grid through Maze.jump_tables().
+    """
+
+    def __init__(self, maze):
+        self.maze = maze
+        self.n = maze.n
+        self._blocks = {}
+
+    def row(self, r):
+        """
+        Scan tables of row r as (offset, is_open, right, left, down, up), built
+        for ROW_BLOCK rows at a time and kept until the maze changes. For cell
+        i = offset + c:
+          right[i] / left[i]  first column from c to the right (n if none) /
+                              left (-1 if none) that is a wall or a jump point
+          down[i] / up[i]     first row from r downwards / upwards, within the
+                              block, that is a wall or stops a vertical scan;
+                              the row just past the block if none
+        The goal is not in the tables; JPS checks it on the way.
+        """
+        block, row = divmod(r, ROW_BLOCK)
+        table = self._blocks.get(block)
+        if table is None:
+            table = self._blocks[block] = self._build(block)
+        return (row * self.n,) + table
+
+    def _build(self, block):
+        """Builds the scan tables of one block of rows in a few NumPy passes."""
+        n = self.n
+        top = block * ROW_BLOCK
+        rows = min(ROW_BLOCK, n - top)
+        lo, hi = max(top - 1, 0), min(top + rows + 1, n)
+
+        # Open cells with a closed border all around, so edges need no special case
+        padded = np.zeros((rows + 2, n + 2), dtype=bool)
+        padded[lo - top + 1:hi - top + 1, 1:-1] = self.maze._window(lo, 0, hi - lo, n) == 0
+        is_open = padded[1:-1, 1:-1]
+        up, mid, down = padded[:-2], padded[1:-1], padded[2:]
+
+        # Horizontal scans. Forced neighbor: a cell above/below opens up right after a wall
+        forced_right = (up[:, 1:-1] & ~up[:, :-2]) | (down[:, 1:-1] & ~down[:, :-2])
+        forced_left = (up[:, 1:-1] & ~up[:, 2:]) | (down[:, 1:-1] & ~down[:, 2:])
+        cols = np.arange(n, dtype=np.intc)
+        stops = np.where(~is_open | forced_right, cols, n)
+        right = np.minimum.accumulate(stops[:, ::-1], axis=1)[:, ::-1]
+        left = np.maximum.accumulate(np.where(~is_open | forced_left, cols, -1), axis=1)
+
+        # A vertical scan stops where a horizontal branch (from c + 1 or c - 1) ends on a jump point
+        from_right = np.full((rows, n), n, dtype=np.intc)
+        from_right[:, :-1] = right[:, 1:]
+        from_left = np.full((rows, n), -1, dtype=np.intc)
+        from_left[:, 1:] = left[:, :-1]
+        branch = (np.take_along_axis(mid[:, 1:], from_right, axis=1) |
+                  np.take_along_axis(mid[:, :-1], from_left + 1, axis=1))
+
+        # Vertical scans. Forced neighbor: a cell left/right opens up right after a wall
+        forced_down = (mid[:, :-2] & ~up[:, :-2]) | (mid[:, 2:] & ~up[:, 2:])
+        forced_up = (mid[:, :-2] & ~down[:, :-2]) | (mid[:, 2:] & ~down[:, 2:])
+        row_ids = np.arange(top, top + rows, dtype=np.intc)[:, None]
+        stops = np.where(~is_open | forced_down | branch, row_ids, top + rows)
+        down_stop = np.minimum.accumulate(stops[::-1], axis=0)[::-1]
+        up_stop = np.maximum.accumulate(np.where(~is_open | forced_up | branch, row_ids, top - 1), axis=0)
+
+        return (is_open.astype(np.uint8).tobytes(),
+                array('i', right.astype(np.intc).tobytes()),
+                array('i', left.astype(np.intc).tobytes()),
+                array('i', down_stop.astype(np.intc).tobytes()),
+                array('i', up_stop.astype(np.intc).tobytes()))
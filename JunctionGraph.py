@@ -0,0 +1,278 @@
+import heapq
+from array import array
+
+import numpy as np
+
+from Heuristics import flat_heuristic
+
+class JunctionGraph:
+    """
+    The maze reduced to a weighted graph of junctions.
+
+    1. Dead ends are pruned: cells with at most one open neighbor are peeled
+       off repeatedly, leaving the "core" (every core cell has >= 2 core
+       neighbors). Each peeled cell remembers the neighbor it hung from
+       (tree_parent), so a start or goal inside a dead-end branch is walked
+       to the core directly.
+    2. Corridors are collapsed: core cells with exactly two core neighbors
+       are folded into the edge joining the junctions at either end. Edges
+       keep their interior cells (in u -> v order) for path expansion, and
+       arcs carry both the step count and the terrain cost of the crossing.
+
+    Built once per grid by Maze.junction_graph().
+    """
+
+    def __init__(self, maze):
+        self.maze_obj = maze
+        self.n = maze.n
+        size = self.n * self.n
+        offsets, neighbors = maze.adjacency()
+        costs = maze.costs
+
+        # ----- 1. Peel dead-end branches -----
+        is_open = maze.as_array().reshape(-1) == 0
+        degree = array('i', np.where(is_open, np.diff(np.asarray(offsets)), 0).astype(np.intc).tobytes())
+        removed = bytearray(size)
+        # -1: core cell (or the last cell of a component that is all tree)
+        self.tree_parent = tree_parent = array('i', [-1]) * size
+
+        stack = np.flatnonzero(is_open & (np.asarray(degree) <= 1)).tolist()
+        while stack:
+            current = stack.pop()
+            removed[current] = 1
+            for nxt in neighbors[offsets[current]:offsets[current + 1]]:
+                if not removed[nxt]:
+                    # At most one neighbor is left: the branch hangs from it
+                    tree_parent[current] = nxt
+                    degree[nxt] -= 1
+                    if degree[nxt] == 1:
+                        stack.append(nxt)
+        # core[cell] = 1 for open cells that survived the peeling
+        self.core = bytearray((is_open & (np.frombuffer(removed, dtype=np.uint8) == 0)).astype(np.uint8).tobytes())
+
+        # ----- 2. Collapse corridors into edges between junctions -----
+        core = self.core
+        # node_id[cell] for junction cells, -1 otherwise
+        self.node_id = node_id = array('i', [-1]) * size
+        # For corridor (interior) cells: their edge and position along it
+        self.edge_of = edge_of = array('i', [-1]) * size
+        self.edge_pos = edge_pos = array('i', [-1]) * size
+        self.nodes = nodes = array('i')
+        for cell in range(size):
+            if core[cell] and degree[cell] != 2:
+                node_id[cell] = len(nodes)
+                nodes.append(cell)
+
+        self.edge_u, self.edge_v = array('i'), array('i')
+        self.edge_offsets = array('i', [0])
+        self.edge_cells = array('i')
+        arcs = []  # (source node, target node, edge, forward, steps, cost)
+
+        def walk(u, first):
+            """Follows a corridor from junction u through neighbor first; returns (interior, end)."""
+            interior = []
+            prev, cur = u, first
+            while node_id[cur] == -1:
+                interior.append(cur)
+                for nxt in neighbors[offsets[cur]:offsets[cur + 1]]:
+                    if core[nxt] and nxt != prev:
+                        prev, cur = cur, nxt
+                        break
+            return interior, cur
+
+        def add_edges(u):
+            for first in neighbors[offsets[u]:offsets[u + 1]]:
+                if not core[first]:
+                    continue
+                # Each corridor is walked once: skip it from the other end
+                if node_id[first] != -1:
+                    if first < u:
+                        continue
+                elif edge_of[first] != -1:
+                    continue
+                interior, v = walk(u, first)
+                e = len(self.edge_u)
+                for pos, cell in enumerate(interior):
+                    edge_of[cell], edge_pos[cell] = e, pos
+                self.edge_u.append(u)
+                self.edge_v.append(v)
+                self.edge_cells.extend(interior)
+                self.edge_offsets.append(len(self.edge_cells))
+
+                inner_cost = sum(costs[c] for c in interior)
+                steps = len(interior) + 1
+                arcs.append((node_id[u], node_id[v], e, 1, steps, inner_cost + costs[v]))
+                arcs.append((node_id[v], node_id[u], e, 0, steps, inner_cost + costs[u]))
+
+        for u in list(nodes):
+            add_edges(u)
+        # Rings with no junction at all: promote one cell to a junction
+        for cell in range(size):
+            if core[cell] and node_id[cell] == -1 and edge_of[cell] == -1:
+                node_id[cell] = len(nodes)
+                nodes.append(cell)
+                add_edges(cell)
+
+        # Arcs in CSR form, per source node
+        arcs.sort(key=lambda arc: arc[0])
+        self.arc_offsets = array('i', [0]) * (len(nodes) + 1)
+        for arc in arcs:
+            self.arc_offsets[arc[0] + 1] += 1
+        for i in range(len(nodes)):
+            self.arc_offsets[i + 1] += self.arc_offsets[i]
+        self.arc_target = array('i', (arc[1] for arc in arcs))
+        self.arc_edge = array('i', (arc[2] for arc in arcs))
+        self.arc_forward = bytearray(arc[3] for arc in arcs)
+        self.arc_steps = array('q', (arc[4] for arc in arcs))
+        self.arc_cost = array('q', (arc[5] for arc in arcs))
+
+    # ----------------- Queries -----------------
+
+    def _chain(self, cell):
+        """Cells from `cell` up its dead-end branch to the core (or the branch's root)."""
+        chain = [cell]
+        tree_parent = self.tree_parent
+        while tree_parent[cell] != -1:
+            cell = tree_parent[cell]
+            chain.append(cell)
+        return chain
+
+    def _interior(self, e):
+        return self.edge_cells[self.edge_offsets[e]:self.edge_offsets[e + 1]]
+
+    def _edge_cells(self, e, forward):
+        """Cells entered when crossing edge e (interior plus far end)."""
+        interior = self._interior(e)
+        if forward:
+            return list(interior) + [self.edge_v[e]]
+        return list(reversed(interior)) + [self.edge_u[e]]
+
+    def search(self, start, goal, use_costs=False, heuristic_type=None):
+        """
+        Shortest path between flat cell ids on the junction graph: Dijkstra
+        over step counts (or terrain costs with use_costs=True), or A* when a
+        heuristic name is given. Returns (path, nodes_explored) with the path
+        expanded back to (row, col) cells; nodes_explored counts settled graph
+        nodes, not cells.
+        """
+        n = self.n
+        costs = self.maze_obj.costs
+
+        # Dead-end branches: if the two chains meet, the path never enters the core
+        chain_s, chain_g = self._chain(start), self._chain(goal)
+        where_s = {cell: i for i, cell in enumerate(chain_s)}
+        for j, cell in enumerate(chain_g):
+            if cell in where_s:
+                cells = chain_s[:where_s[cell] + 1] + chain_g[:j][::-1]
+                return [divmod(c, n) for c in cells], 0
+        a, b = chain_s[-1], chain_g[-1]
+
+        def weight(cells):
+            return sum(costs[c] for c in cells) if use_costs else len(cells)
+
+        # Node ids: junctions 0..N-1, then the virtual START and GOAL
+        node_id = self.node_id
+        N = len(self.nodes)
+        START, GOAL = N, N + 1
+        # Extra arcs touching the virtual nodes: source -> [(target, weight, cells)]
+        extra = {}
+
+        if node_id[a] != -1:
+            extra[START] = [(node_id[a], 0, [])]
+        else:
+            e, k = self.edge_of[a], self.edge_pos[a]
+            interior = self._interior(e)
+            back = list(reversed(interior[:k])) + [self.edge_u[e]]
+            ahead = list(interior[k + 1:]) + [self.edge_v[e]]
+            extra[START] = [(node_id[self.edge_u[e]], weight(back), back),
+                            (node_id[self.edge_v[e]], weight(ahead), ahead)]
+
+        if node_id[b] != -1:
+            extra.setdefault(node_id[b], []).append((GOAL, 0, []))
+        else:
+            e, k = self.edge_of[b], self.edge_pos[b]
+            interior = self._interior(e)
+            from_u = list(interior[:k + 1])
+            from_v = list(reversed(interior[k:]))
+            extra.setdefault(node_id[self.edge_u[e]], []).append((GOAL, weight(from_u), from_u))
+            extra.setdefault(node_id[self.edge_v[e]], []).append((GOAL, weight(from_v), from_v))
+            # Start on the same corridor: walk straight along it
+            if node_id[a] == -1 and self.edge_of[a] == e:
+                ka = self.edge_pos[a]
+                direct = list(interior[ka + 1:k + 1]) if ka < k else list(reversed(interior[k:ka]))
+                extra[START].append((GOAL, weight(direct), direct))
+
+        nodes = self.nodes
+        if heuristic_type is None:
+            def h(node):
+                return 0
+        else:
+            # Aim at b, where the goal's branch joins the core: the graph search ends there
+            heuristic = flat_heuristic(heuristic_type, n, divmod(b, n))
+
+            def h(node):
+                return heuristic(nodes[node]) if node < N else 0
+
+        arc_offsets, arc_target = self.arc_offsets, self.arc_target
+        arc_weight = self.arc_cost if use_costs else self.arc_steps
+
+        g_score = array('q', [-1]) * (N + 2)
+        # How each node was reached: previous node plus the arc taken, or -1 for
+        # a virtual arc whose cells are kept in via_cells
+        via_node = array('i', [-1]) * (N + 2)
+        via_arc = array('i', [-1]) * (N + 2)
+        via_cells = {}
+        closed = bytearray(N + 2)
+        g_score[START] = 0
+        # Entries are (f, -g, node), breaking f ties towards larger g like AStarSearch
+        open_set = [(0, 0, START)]
+        nodes_explored = 0
+
+        while open_set:
+            _, _, current = heapq.heappop(open_set)
+            if closed[current]:
+                continue
+            closed[current] = 1
+            nodes_explored += 1
+            if current == GOAL:
+                break
+
+            base = g_score[current]
+            if current < N:
+                for arc in range(arc_offsets[current], arc_offsets[current + 1]):
+                    nxt = arc_target[arc]
+                    tentative_g = base + arc_weight[arc]
+                    known = g_score[nxt]
+                    if known == -1 or tentative_g < known:
+                        g_score[nxt] = tentative_g
+                        via_node[nxt], via_arc[nxt] = current, arc
+                        heapq.heappush(open_set, (tentative_g + h(nxt), -tentative_g, nxt))
+
+            for nxt, w, cells in extra.get(current, ()):
+                tentative_g = base + w
+                known = g_score[nxt]
+                if known == -1 or tentative_g < known:
+                    g_score[nxt] = tentative_g
+                    via_node[nxt], via_arc[nxt] = current, -1
+                    via_cells[nxt] = cells
+                    heapq.heappush(open_set, (tentative_g + h(nxt), -tentative_g, nxt))
+
+        if not closed[GOAL]:
+            return [], nodes_explored
+
+        # Expand START -> ... -> GOAL back into cells
+        pieces = []
+        cur = GOAL
+        while cur != START:
+            arc = via_arc[cur]
+            if arc == -1:
+                pieces.append(via_cells[cur])
+            else:
+                pieces.append(self._edge_cells(self.arc_edge[arc], self.arc_forward[arc]))
+            cur = via_node[cur]
+
+        cells = chain_s[:]
+        for piece in reversed(pieces):
+            cells.extend(piece)
+        cells.extend(reversed(chain_g[:-1]))
+        return [divmod(c, n) for c in cells], nodes_explored
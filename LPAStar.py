@@ -0,0 +1,163 @@
+import heapq
+from array import array
+
+from Heuristics import flat_heuristic
+from SearchStats import SearchStats
+
+INF = float("inf")
+
+class LPAStar:
+    """
+    Lifelong Planning A*: an incremental A* for mazes whose walls (or terrain
+    costs) change between queries.
+
+    The planner subscribes to the maze's change notifications. The first
+    solve() is an ordinary A* search; later solves with the same start and
+    goal keep every g value from the previous search and only re-expand the
+    cells whose distance the edits actually changed, so a wall toggled far
+    from the path costs almost nothing. nodes_explored counts the expansions
+    made by that call, i.e. the re-expansions of a repair (compare with a
+    fresh AStarSearch to see the saving).
+
+    g[u] is the distance settled by the last search, rhs[u] the one-step
+    lookahead min(g[pred] + cost(u)); cells where they differ are queued.
+    """
+
+    # solve() keeps its search state, so SearchStats must not rerun a query
+    stats_repeatable = False
+
+    def __init__(self, maze, heuristic_type="manhattan"):
+        self.maze_obj = maze
+        self.n = maze.n
+        self.heuristic_type = heuristic_type.lower()
+        # (start_id, goal_id) the kept search state belongs to
+        self._endpoints = None
+        # Cells edited since the last solve
+        self._dirty = set()
+        maze.subscribe(self._on_change)
+
+    def close(self):
+        """Stops listening to the maze."""
+        self.maze_obj.unsubscribe(self._on_change)
+
+    def _on_change(self, cells):
+        if self._endpoints is not None:
+            self._dirty.update(cells)
+
+    # ----------------- LPA* core -----------------
+
+    def _reset(self, s, g):
+        size = self.n * self.n
+        self.g = array('d', [INF]) * size
+        self.rhs = array('d', [INF]) * size
+        self.rhs[s] = 0
+        self._h = flat_heuristic(self.heuristic_type, self.n, divmod(g, self.n))
+        self._open = [(self._h(s), 0, s)]
+        self._endpoints = (s, g)
+        self._dirty = set()
+
+    def _key(self, u):
+        k = min(self.g[u], self.rhs[u])
+        return (k + self._h(u), k)
+
+    def _update_vertex(self, u):
+        """Recomputes rhs[u] from u's open neighbors and queues u if it is inconsistent."""
+        g, rhs = self.g, self.rhs
+        if u != self._endpoints[0]:
+            if self.maze_obj.cells[u]:
+                rhs[u] = INF
+            else:
+                cost = self.maze_obj.costs[u]
+                best = INF
+                for pred in self.maze_obj.open_neighbors(u):
+                    if g[pred] < best:
+                        best = g[pred]
+                rhs[u] = best + cost
+        # Stale heap entries are skipped on pop, so there is nothing to remove here
+        if g[u] != rhs[u]:
+            k1, k2 = self._key(u)
+            heapq.heappush(self._open, (k1, k2, u))
+
+    def _top(self):
+        """Drops stale entries off the heap; returns the valid top key or None."""
+        open_set = self._open
+        g, rhs = self.g, self.rhs
+        while open_set:
+            k1, k2, u = open_set[0]
+            if g[u] != rhs[u] and (k1, k2) == self._key(u):
+                return (k1, k2)
+            heapq.heappop(open_set)
+        return None
+
+    def _compute_shortest_path(self):
+        g, rhs = self.g, self.rhs
+        goal = self._endpoints[1]
+        open_neighbors = self.maze_obj.open_neighbors
+        expanded = 0
+
+        while True:
+            top = self._top()
+            if top is None or (top >= self._key(goal) and rhs[goal] == g[goal]):
+                break
+            _, _, u = heapq.heappop(self._open)
+            expanded += 1
+
+            if g[u] > rhs[u]:
+                # Overconsistent: the distance dropped, settle it
+                g[u] = rhs[u]
+                for nxt in open_neighbors(u):
+                    self._update_vertex(nxt)
+            else:
+                # Underconsistent: the old distance no longer holds, redo u and its successors
+                g[u] = INF
+                self._update_vertex(u)
+                for nxt in open_neighbors(u):
+                    self._update_vertex(nxt)
+
+        return expanded
+
+    def _extract_path(self):
+        """Walks from the goal to the start along the smallest g values."""
+        s, goal = self._endpoints
+        g = self.g
+        path = [goal]
+        cur = goal
+        while cur != s:
+            cur = min(self.maze_obj.open_neighbors(cur), key=g.__getitem__)
+            path.append(cur)
+        path.reverse()
+        return [divmod(cell, self.n) for cell in path]
+
+    def solve(self, start=(0, 0), goal=None, stats=False):
+        # Opt-in instrumentation: returns (path, nodes_explored, SearchStats). Runs the query
+        # up to three times: a timed solve(), an events() pass for the counters and a
+        # traced solve() for memory (see SearchStats.measure)
+        if stats:
+            return SearchStats.measure(self, start, goal)
+
+        if goal is None:
+            goal = (self.n - 1, self.n - 1)
+
+        maze = self.maze_obj
+        s = maze.index(start)
+        g = maze.index(goal)
+        # No reachable() short-circuit: relabeling components after every edit
+        # would cost a full pass, and LPA* finds out itself (g[goal] stays INF)
+        if maze.cells[s] or maze.cells[g]:
+            self._endpoints = None
+            return [], 0
+
+        if self._endpoints != (s, g):
+            self._reset(s, g)
+        else:
+            # Repair: an edited cell changes its own rhs (walls, cost) and its neighbors'
+            for u in self._dirty:
+                self._update_vertex(u)
+                for nxt in maze.open_neighbors(u):
+                    self._update_vertex(nxt)
+            self._dirty = set()
+
+        nodes_explored = self._compute_shortest_path()
+        if self.g[g] == INF:
+            return [], nodes_explored
+        return self._extract_path(), nodes_explored
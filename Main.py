@@ -3,6 +3,7 @@ from Maze import Maze
 from BFS import BFS    
 from DFS import DFS
 from AStarSearch import AStarSearch
+from JPS import JPS
 from UCS import UCS
 from IDS import IDS
 from HillClimbing import HillClimbing
@@ -22,9 +23,9 @@ print("=== Results ===")
 # ----------------- BFS Section -----------------
 bfs_solver = BFS(maze)
 
-t_start = time.time()
+t_start = time.perf_counter()
 bfs_path, bfs_nodes = bfs_solver.solve(start, goal)
-bfs_time = (time.time() - t_start) * 1000
+bfs_time = (time.perf_counter() - t_start) * 1000
 
 print(f"BFS: length={len(bfs_path)}, explored={bfs_nodes}, time={bfs_time:.2f} ms")
 if bfs_path:
@@ -38,9 +39,9 @@ print("-" * 30)
 # ----------------- DFS Section -----------------
 dfs_solver = DFS(maze)
 
-t_start = time.time()
+t_start = time.perf_counter()
 dfs_path, dfs_nodes = dfs_solver.solve(start, goal)
-dfs_time = (time.time() - t_start) * 1000
+dfs_time = (time.perf_counter() - t_start) * 1000
 
 print(f"DFS: length={len(dfs_path)}, explored={dfs_nodes}, time={dfs_time:.2f} ms")
 if dfs_path:
@@ -55,9 +56,9 @@ print("-" * 30)
 # We now explicitly pass the heuristic_type="manhattan"
 astar_solver = AStarSearch(maze, heuristic_type="manhattan")
 
-t_start = time.time()
+t_start = time.perf_counter()
 astar_path, astar_nodes = astar_solver.solve(start, goal)
-astar_time = (time.time() - t_start) * 1000
+astar_time = (time.perf_counter() - t_start) * 1000
 
 print(f"A* (Manhattan): length={len(astar_path)}, explored={astar_nodes}, time={astar_time:.2f} ms")
 
@@ -66,13 +67,28 @@ if astar_path:
     maze.print_maze(astar_path)
 else:
     print("A*: No path found")
+
+# ----------------- Jump Point Search Section -----------------
+jps_solver = JPS(maze)
+
+t_start = time.perf_counter()
+jps_path, jps_nodes = jps_solver.solve(start, goal)
+jps_time = (time.perf_counter() - t_start) * 1000
+
+print(f"JPS: length={len(jps_path)}, explored={jps_nodes}, time={jps_time:.2f} ms")
+
+if jps_path:
+    print("JPS Path:")
+    maze.print_maze(jps_path)
+else:
+    print("JPS: No path found")
     
 # ----------------- UCS Section -----------------
 ucs_solver = UCS(maze)
 
-t_start = time.time()
+t_start = time.perf_counter()
 ucs_path, ucs_nodes = ucs_solver.solve(start, goal)
-ucs_time = (time.time() - t_start) * 1000
+ucs_time = (time.perf_counter() - t_start) * 1000
 
 
 print(f"UCS: length={len(ucs_path)}, explored={ucs_nodes}, time={ucs_time:.2f} ms")
@@ -86,9 +102,9 @@ else:
 # ----------------- IDS Section -----------------
 ids_solver = IDS(maze)
 
-t_start = time.time()
+t_start = time.perf_counter()
 ids_path, ids_nodes = ids_solver.solve(start, goal)
-ids_time = (time.time() - t_start) * 1000
+ids_time = (time.perf_counter() - t_start) * 1000
 
 print(f"IDS: length={len(ids_path)}, explored={ids_nodes}, time={ids_time:.2f} ms")
 if ids_path:
@@ -100,9 +116,9 @@ else:
 # ----------------- Hill Climbing Section -----------------
 hc_solver = HillClimbing(maze)
 
-t_start = time.time()
+t_start = time.perf_counter()
 hc_path, hc_nodes = hc_solver.solve(start, goal)
-hc_time = (time.time() - t_start) * 1000
+hc_time = (time.perf_counter() - t_start) * 1000
 
 print(f"Hill Climbing: length={len(hc_path)}, explored={hc_nodes}, time={hc_time:.2f} ms")
 if hc_path:
@@ -116,9 +132,9 @@ else:
 # You can adjust population_size and generations to improve accuracy
 ga_solver = GeneticAlgorithm(maze, population_size=100, generations=200, heuristic_type="manhattan")
 
-t_start = time.time()
+t_start = time.perf_counter()
 ga_path, ga_nodes = ga_solver.solve(start, goal)
-ga_time = (time.time() - t_start) * 1000
+ga_time = (time.perf_counter() - t_start) * 1000
 
 print(f"Genetic Algorithm (Manhattan): length={len(ga_path)}, explored={ga_nodes}, time={ga_time:.2f} ms")
 
@@ -133,9 +149,9 @@ else:
 # ----------------- Greedy Best-First Search Section -----------------
 greedy_solver = GreedyBFS(maze)
 
-t_start = time.time()
+t_start = time.perf_counter()
 greedy_path, greedy_nodes = greedy_solver.solve(start, goal)
-greedy_time = (time.time() - t_start) * 1000
+greedy_time = (time.perf_counter() - t_start) * 1000
 
 print(f"Greedy BFS: length={len(greedy_path)}, explored={greedy_nodes}, time={greedy_time:.2f} ms")
 
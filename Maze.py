@@ -1,39 +1,741 @@
+import hashlib
 import random
+import struct
+import sys
+import tempfile
+from array import array
+from contextlib import contextmanager
+
+import numpy as np
+
+from JumpTables import JumpTables
+from JunctionGraph import JunctionGraph
+
+# print_maze summary characters, by the share of walls in a block (none .. all)
+SHADES = " ░▒▓█"
+
+# Neighbor order shared by every solver: down, up, right, left
+DIRECTIONS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+
+# Maze file header: magic, format version, n, wall_prob, seed (-1 = none), max_cost, padded to 64 bytes.
+# The header is followed by n rows of ceil(n / 8) bytes, one bit per cell (1 = wall), MSB first.
+# Weighted mazes (max_cost > 1) then store n * n bytes of cell costs, row-major.
+# Version 1 files have no max_cost field; its padding reads as 0, i.e. unweighted.
+FILE_MAGIC = b"MAZEBITS"
+FILE_VERSION = 2
+FILE_HEADER = struct.Struct("<8sIQdqI")
+FILE_HEADER_SIZE = 64
+
+# Component labels of a mapped maze, kept in a file next to it (path + LABELS_SUFFIX):
+# magic and the maze's fingerprint, padded to 64 bytes, then n * n int32 labels, row-major.
+LABELS_MAGIC = b"MAZELBLS"
+LABELS_SUFFIX = ".labels"
+
+
+class PackedCells:
+    """
+    Flat, read-through view of a bit-packed (n, ceil(n / 8)) uint8 buffer,
+    addressed like Maze.cells by row * n + col. Nothing is unpacked up front.
+    """
+
+    def __init__(self, packed, n):
+        self.n = n
+        self.row_bytes = packed.shape[1]
+        # memoryview indexing returns plain ints, much cheaper than NumPy scalars
+        self.buffer = memoryview(packed.reshape(-1))
+
+    def __len__(self):
+        return self.n * self.n
+
+    def __getitem__(self, idx):
+        r, c = divmod(idx, self.n)
+        return (self.buffer[r * self.row_bytes + (c >> 3)] >> (7 - (c & 7))) & 1
+
+    def __setitem__(self, idx, value):
+        r, c = divmod(idx, self.n)
+        byte = r * self.row_bytes + (c >> 3)
+        mask = 1 << (7 - (c & 7))
+        if value:
+            self.buffer[byte] |= mask
+        else:
+            self.buffer[byte] &= ~mask & 0xFF
+
+
+class GridRow:
+    """One row of Maze.grid, indexable like a list of 0/1 ints; writes go through set_cell."""
+
+    def __init__(self, maze, r):
+        self.maze = maze
+        self.r = r
+        self.row_start = r * maze.n
+
+    def __len__(self):
+        return self.maze.n
+
+    def __getitem__(self, c):
+        if isinstance(c, slice):
+            return [self[i] for i in range(*c.indices(self.maze.n))]
+        return self.maze.cells[self.row_start + range(self.maze.n)[c]]
+
+    def __setitem__(self, c, value):
+        self.maze.set_cell((self.r, range(self.maze.n)[c]), value)
+
+    def __iter__(self):
+        cells = self.maze.cells
+        for c in range(self.maze.n):
+            yield cells[self.row_start + c]
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class GridView:
+    """
+    grid[r][c]-style access to Maze.cells. The cells are the only copy of
+    the walls, so reads always see the current maze, and assignments are
+    edits made through set_cell (they bump version and notify listeners).
+    """
+
+    def __init__(self, maze):
+        self.maze = maze
+
+    def __len__(self):
+        return self.maze.n
+
+    def __getitem__(self, r):
+        return GridRow(self.maze, range(self.maze.n)[r])
+
+    def __iter__(self):
+        for r in range(self.maze.n):
+            yield GridRow(self.maze, r)
+
 
 class Maze:
-    def __init__(self, n, wall_prob=0.3):
+    def __init__(self, n, wall_prob=0.3, seed=None, max_cost=1):
         self.n = n
         self.wall_prob = wall_prob
-        self.grid = self._generate_maze()
+        self.seed = seed
+        # Terrain: stepping onto a cell costs 1..max_cost (max_cost=1 is the plain unit-cost maze)
+        self.max_cost = max_cost
+        self._costs = None
+        self._cells = self._generate_maze()
+        # Bumped on every edit made through set_cell; caches compare against it
+        self.version = 0
+        self._adjacency = None
+        self._components = None
+        self._junction_graph = None
+        self._jump_tables = None
+        self._fingerprint = None
+        # Bit-packed (n, ceil(n / 8)) buffer and file path for mazes loaded with Maze.open
+        self._packed = None
+        self._path = None
+        # Change notification: callbacks, and cells edited inside an edits() block
+        self._listeners = []
+        self._pending = None
 
     def _generate_maze(self):
-        """Generates the N x N maze grid."""
-        maze = []
-        for i in range(self.n):
-            row = []
-            for j in range(self.n):
-                if random.random() < self.wall_prob:
-                    row.append(1)  # wall
-                else:
-                    row.append(0)  # path
-            maze.append(row)
+        """Generates the N x N maze cells (reproducible when a seed is given)."""
+        rng = random.Random(self.seed) if self.seed is not None else random
+        # Row-major draws, 1 = wall, 0 = path
+        maze = bytearray(1 if rng.random() < self.wall_prob else 0 for _ in range(self.n * self.n))
 
         # Ensure start and goal are open
-        maze[0][0] = 0
-        maze[self.n-1][self.n-1] = 0
+        maze[0] = 0
+        maze[-1] = 0
+
+        # Costs are drawn after the walls, so a seed gives the same walls at any max_cost
+        if self.max_cost > 1:
+            self._costs = bytearray(rng.randint(1, self.max_cost) for _ in range(self.n * self.n))
         return maze
 
-    def print_maze(self, path=None):
-        """Prints the maze to the console, optionally marking a path."""
-        # Create a deep copy for printing so we don't modify the actual grid
-        maze_copy = [row[:] for row in self.grid]
+    # ----------------- Flat (integer id) representation -----------------
+
+    def index(self, pos):
+        """Converts a (row, col) cell into its flat integer id."""
+        return pos[0] * self.n + pos[1]
+
+    def position(self, idx):
+        """Converts a flat integer id back into a (row, col) cell."""
+        return divmod(idx, self.n)
+
+    @property
+    def cells(self):
+        """
+        The walls, one byte per cell (1 = wall, 0 = path), addressed by the
+        flat id row * n + col. Bit-packed and read through for mapped mazes.
+        """
+        return self._cells
+
+    @property
+    def grid(self):
+        """The cells as grid[r][c] (see GridView); assigning to a cell calls set_cell."""
+        return GridView(self)
+
+    @property
+    def weighted(self):
+        """True when cells have terrain costs other than 1."""
+        return self.max_cost > 1
+
+    @property
+    def costs(self):
+        """
+        Cost of stepping onto each cell (1..max_cost), one byte per cell
+        addressed by flat id. All ones for unweighted mazes.
+        """
+        if self._costs is None:
+            self._costs = bytearray(b"\x01") * (self.n * self.n)
+        return self._costs
+
+    def path_cost(self, path):
+        """Total cost of a (row, col) path: the costs of every cell entered after the first."""
+        costs = self.costs
+        return sum(costs[x * self.n + y] for x, y in path[1:])
+
+    def as_array(self):
+        """
+        Returns the cells as an (n, n) NumPy uint8 array: a view (no copy) for
+        in-memory mazes, an unpacked copy for memory-mapped ones.
+        """
+        if self._packed is not None:
+            return np.unpackbits(self._packed, axis=1, count=self.n)
+        return np.frombuffer(self.cells, dtype=np.uint8).reshape(self.n, self.n)
+
+    def _packed_blocks(self, block_rows=1024):
+        """Yields the grid as bit-packed row blocks (the on-disk layout)."""
+        for r0 in range(0, self.n, block_rows):
+            if self._packed is not None:
+                yield np.asarray(self._packed[r0:r0 + block_rows])
+            else:
+                rows = self.as_array()[r0:r0 + block_rows]
+                yield np.packbits(rows, axis=1)
+
+    def adjacency(self):
+        """
+        Returns the precomputed open-neighbor table in CSR form (offsets, indices).
+        The open neighbors of cell i are indices[offsets[i]:offsets[i + 1]],
+        listed in DIRECTIONS order. Built once per grid and shared by all solvers.
+        """
+        if self._adjacency is None:
+            n = self.n
+            is_open = self.as_array() == 0
+            ids = np.arange(n * n, dtype=np.intc).reshape(n, n)
+
+            # table[r, c, k] = id of the k-th neighbor of (r, c) if it is open, else -1
+            table = np.full((n, n, 4), -1, dtype=np.intc)
+            table[:-1, :, 0] = np.where(is_open[1:, :], ids[1:, :], -1)   # down
+            table[1:, :, 1] = np.where(is_open[:-1, :], ids[:-1, :], -1)  # up
+            table[:, :-1, 2] = np.where(is_open[:, 1:], ids[:, 1:], -1)   # right
+            table[:, 1:, 3] = np.where(is_open[:, :-1], ids[:, :-1], -1)  # left
+            table = table.reshape(-1, 4)
+
+            valid = table >= 0
+            offsets = np.zeros(n * n + 1, dtype=np.intc)
+            np.cumsum(valid.sum(axis=1), out=offsets[1:])
+            indices = table[valid]  # row-major, so per-cell DIRECTIONS order is kept
+
+            # array('i') gives compact storage and plain-int indexing in the solvers
+            self._adjacency = (array('i', offsets.tobytes()), array('i', indices.tobytes()))
+        return self._adjacency
+
+    def components(self):
+        """
+        Connected-component labels as a flat int32 NumPy array of n * n values:
+        0 for walls, 1..k for the open regions. Built once per grid (4 bytes per
+        cell) by label_components; for memory-mapped mazes, out of core into a
+        mapped labels file (see _mapped_components).
+        """
+        if self._components is None:
+            if self._packed is not None:
+                self._components = self._mapped_components()
+            else:
+                self._components = label_components(self.as_array() == 0).reshape(-1)
+        return self._components
+
+    def _mapped_components(self, block_cells=1 << 20):
+        """
+        Labels a memory-mapped maze a block of rows at a time, so RSS stays
+        bounded: each block is labeled on its own and written out, regions
+        touching across block edges are joined, and a second pass renumbers
+        the file in place. The file (path + LABELS_SUFFIX) is reused by later
+        opens while the maze's fingerprint matches; if it cannot be written,
+        an anonymous temporary file is used instead.
+        """
+        n = self.n
+        header = (LABELS_MAGIC + self.fingerprint().encode()).ljust(FILE_HEADER_SIZE, b"\0")
+        labels_path = self._path + LABELS_SUFFIX
+        try:
+            with open(labels_path, "rb") as f:
+                if f.read(FILE_HEADER_SIZE) == header:
+                    return np.memmap(labels_path, dtype=np.int32, mode="r",
+                                     offset=FILE_HEADER_SIZE, shape=(n * n,))
+        except OSError:
+            pass
+
+        try:
+            f = open(labels_path, "w+b")
+        except OSError:
+            f = tempfile.TemporaryFile()
+        with f:
+            # The header goes in last, so an interrupted build is never reused
+            f.write(bytes(FILE_HEADER_SIZE))
+            block_rows = max(1, block_cells // n)
+            count = 0
+            above = None
+            u, v = [np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.int64)]
+            for r0 in range(0, n, block_rows):
+                is_open = self._window(r0, 0, min(block_rows, n - r0), n) == 0
+                labels = label_components(is_open)
+                regions = int(labels.max(initial=0))
+                labels[is_open] += count
+                if above is not None:
+                    touch = (above > 0) & is_open[0]
+                    u.append(above[touch].astype(np.int64))
+                    v.append(labels[0][touch].astype(np.int64))
+                above = labels[-1].copy()
+                count += regions
+                f.write(labels.tobytes())
+
+            root = _join_roots(np.arange(count + 1, dtype=np.int64), np.concatenate(u), np.concatenate(v))
+            # Walls keep label 0, the smallest root
+            final = np.unique(root, return_inverse=True)[1].astype(np.int32)
+            for r0 in range(0, n, block_rows):
+                offset = FILE_HEADER_SIZE + 4 * r0 * n
+                f.seek(offset)
+                block = np.fromfile(f, dtype=np.int32, count=min(block_rows, n - r0) * n)
+                f.seek(offset)
+                f.write(final[block].tobytes())
+            f.seek(0)
+            f.write(header)
+            f.flush()
+            return np.memmap(f, dtype=np.int32, mode="r", offset=FILE_HEADER_SIZE, shape=(n * n,))
+
+    def reachable(self, a, b):
+        """
+        True when (row, col) cells a and b are open and in the same connected
+        component. The first query labels the maze (see components()).
+        """
+        ia, ib = self.index(a), self.index(b)
+        cells = self.cells
+        if cells[ia] or cells[ib]:
+            return False
+        if ia == ib:
+            return True
+        labels = self.components()
+        return bool(labels[ia] == labels[ib])
 
+    def junction_graph(self):
+        """
+        The maze with dead ends pruned and corridors collapsed into weighted
+        edges between junctions (see JunctionGraph). Built once per grid.
+        """
+        if self._junction_graph is None:
+            self._junction_graph = JunctionGraph(self)
+        return self._junction_graph
+
+    def jump_tables(self):
+        """Straight-line scan tables for JPS (see JumpTables). Built lazily per grid."""
+        if self._jump_tables is None:
+            self._jump_tables = JumpTables(self)
+        return self._jump_tables
+
+    def open_neighbors(self, idx):
+        """
+        Open neighbors of one cell in DIRECTIONS order, read straight from cells.
+        For solvers that touch only a few cells; avoids building the full table.
+        """
+        n = self.n
+        cells = self.cells
+        r, c = divmod(idx, n)
+        result = []
+        if r + 1 < n and cells[idx + n] == 0:
+            result.append(idx + n)
+        if r > 0 and cells[idx - n] == 0:
+            result.append(idx - n)
+        if c + 1 < n and cells[idx + 1] == 0:
+            result.append(idx + 1)
+        if c > 0 and cells[idx - 1] == 0:
+            result.append(idx - 1)
+        return result
+
+    def set_cell(self, pos, value):
+        """
+        Sets one cell to wall (1) or path (0). Edits must go through here so
+        the flat cells, the neighbor table and the fingerprint stay in sync.
+        """
+        self._check_writable()
+        x, y = pos
+        cells = self.cells
+        if cells[x * self.n + y] == value:
+            return
+        cells[x * self.n + y] = value
+        self._adjacency = None
+        self._components = None
+        self._junction_graph = None
+        self._jump_tables = None
+        self._fingerprint = None
+        self.version += 1
+        self._changed(x * self.n + y)
+
+    def _check_writable(self):
+        if self._packed is not None and not self._packed.flags.writeable:
+            raise ValueError("maze opened read-only; use Maze.open(path, writable=True) to edit it")
+
+    def set_wall(self, pos):
+        """Turns one cell into a wall (see set_cell)."""
+        self.set_cell(pos, 1)
+
+    def clear_wall(self, pos):
+        """Opens one cell (see set_cell)."""
+        self.set_cell(pos, 0)
+
+    def set_cost(self, pos, value):
+        """Sets the terrain cost (1..255) of one cell; like set_cell, bumps version."""
+        if not 1 <= value <= 255:
+            raise ValueError(f"Cell cost must be in 1..255, got {value}")
+        self._check_writable()
+        idx = self.index(pos)
+        costs = self.costs
+        if costs[idx] == value:
+            return
+        costs[idx] = value
+        self.max_cost = max(self.max_cost, value)
+        self._junction_graph = None
+        self._jump_tables = None
+        self._fingerprint = None
+        self.version += 1
+        self._changed(idx)
+
+    # ----------------- Change notification -----------------
+
+    def subscribe(self, callback):
+        """
+        Calls callback(cells) after every edit made through set_cell / set_cost,
+        with the flat ids of the cells that changed (once per edits() block).
+        """
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        self._listeners.remove(callback)
+
+    @contextmanager
+    def edits(self):
+        """
+        Groups several edits into one notification:
+
+            with maze.edits():
+                maze.set_wall((3, 4))
+                maze.clear_wall((5, 6))
+        """
+        if self._pending is not None:
+            # Nested block: the outermost one notifies
+            yield self
+            return
+        self._pending = []
+        try:
+            yield self
+        finally:
+            cells, self._pending = self._pending, None
+            if cells:
+                self._notify(list(dict.fromkeys(cells)))
+
+    def _changed(self, idx):
+        if self._pending is not None:
+            self._pending.append(idx)
+        else:
+            self._notify([idx])
+
+    def _notify(self, cells):
+        for callback in list(self._listeners):
+            callback(cells)
+
+    def fingerprint(self):
+        """Content hash of the grid plus its generation metadata (size, wall_prob, seed)."""
+        if self._fingerprint is None:
+            h = hashlib.blake2b(digest_size=16)
+            h.update(repr((self.n, self.wall_prob, self.seed)).encode())
+            # Hash the packed layout so in-memory and mapped copies of a maze agree
+            for block in self._packed_blocks():
+                h.update(block.tobytes())
+            if self.weighted:
+                h.update(self.costs)
+            self._fingerprint = h.hexdigest()
+        return self._fingerprint
+
+    @classmethod
+    def from_array(cls, cells, wall_prob=0.3, seed=None, costs=None, max_cost=None):
+        """
+        Builds an in-memory maze from an (n, n) array of 0/1 cells (no generation).
+        costs, if given, holds the per-cell terrain costs (any n * n sequence of 1..255);
+        max_cost defaults to the largest of them.
+        """
+        cells = np.asarray(cells, dtype=np.uint8)
+        maze = cls.__new__(cls)
+        maze.n = cells.shape[0]
+        maze.wall_prob = wall_prob
+        maze.seed = seed
+        maze._costs = None
+        maze.max_cost = 1
+        if costs is not None:
+            costs = np.asarray(costs, dtype=np.uint8).reshape(-1)
+            maze._costs = bytearray(costs.tobytes())
+            maze.max_cost = max(1, int(costs.max()) if max_cost is None else max_cost)
+        maze.version = 0
+        maze._cells = bytearray(cells.tobytes())
+        maze._adjacency = None
+        maze._components = None
+        maze._junction_graph = None
+        maze._jump_tables = None
+        maze._fingerprint = None
+        maze._packed = None
+        maze._path = None
+        maze._listeners = []
+        maze._pending = None
+        return maze
+
+    def to_packed(self):
+        """
+        Compact picklable form (packed_bits, n, wall_prob, seed, costs, max_cost) for
+        handing a maze to other processes. costs is None for unweighted mazes.
+        """
+        packed = b"".join(block.tobytes() for block in self._packed_blocks())
+        costs = bytes(self.costs) if self.weighted else None
+        return packed, self.n, self.wall_prob, self.seed, costs, self.max_cost
+
+    @classmethod
+    def from_packed(cls, packed, n, wall_prob=0.3, seed=None, costs=None, max_cost=None):
+        """Inverse of to_packed: rebuilds an in-memory maze."""
+        rows = np.frombuffer(packed, dtype=np.uint8).reshape(n, (n + 7) // 8)
+        if costs is not None:
+            costs = np.frombuffer(costs, dtype=np.uint8)
+        return cls.from_array(np.unpackbits(rows, axis=1, count=n), wall_prob, seed, costs, max_cost)
+
+    # ----------------- Bit-packed file format -----------------
+
+    def save(self, path):
+        """Writes the maze in the bit-packed file format (one bit per cell, plus costs if weighted)."""
+        with open(path, "wb") as f:
+            f.write(_file_header(self.n, self.wall_prob, self.seed, self.max_cost))
+            for block in self._packed_blocks():
+                f.write(block.tobytes())
+            if self.weighted:
+                f.write(self.costs)
+
+    @classmethod
+    def open(cls, path, writable=False):
+        """
+        Memory-maps a maze file without reading it. Cells are read straight
+        from the mapped bits, so opening is instant and RSS stays bounded.
+        With writable=True, set_cell writes through to the file; otherwise
+        edits raise ValueError.
+        """
+        with open(path, "rb") as f:
+            magic, version, n, wall_prob, seed, max_cost = FILE_HEADER.unpack(f.read(FILE_HEADER.size))
+        if magic != FILE_MAGIC:
+            raise ValueError(f"{path} is not a maze file")
+        if version > FILE_VERSION:
+            raise ValueError(f"{path} uses maze file format {version}, newer than {FILE_VERSION}")
+
+        mode = "r+" if writable else "r"
+        row_bytes = (n + 7) // 8
+        maze = cls.__new__(cls)
+        maze.n = n
+        maze.wall_prob = wall_prob
+        maze.seed = None if seed < 0 else seed
+        maze.version = 0
+        maze._adjacency = None
+        maze._components = None
+        maze._junction_graph = None
+        maze._jump_tables = None
+        maze._fingerprint = None
+        maze._listeners = []
+        maze._pending = None
+        maze.max_cost = max(1, max_cost)
+        maze._costs = None
+        if maze.weighted:
+            # Cost bytes follow the bit rows; a memoryview indexes as plain ints
+            maze._costs = memoryview(np.memmap(path, dtype=np.uint8, mode=mode,
+                                               offset=FILE_HEADER_SIZE + n * row_bytes, shape=(n * n,)))
+        maze._packed = np.memmap(path, dtype=np.uint8, mode=mode,
+                                 offset=FILE_HEADER_SIZE, shape=(n, row_bytes))
+        maze._cells = PackedCells(maze._packed, n)
+        maze._path = path
+        return maze
+
+    @classmethod
+    def generate_file(cls, path, n, wall_prob=0.3, seed=None, block_cells=1 << 22, max_cost=1):
+        """
+        Generates a maze straight to disk, one row block at a time, so grids far
+        larger than memory can be built. Uses NumPy's generator, so a seed gives
+        a reproducible file (whatever block_cells is) but not the same layout
+        as Maze(n, wall_prob, seed).
+        Returns the memory-mapped maze.
+        """
+        seed_seq = np.random.SeedSequence(seed)
+        rng = np.random.default_rng(seed_seq)
+        block_rows = max(1, block_cells // n)
+
+        with open(path, "wb") as f:
+            f.write(_file_header(n, wall_prob, seed, max_cost))
+            for r0 in range(0, n, block_rows):
+                rows = (rng.random((min(block_rows, n - r0), n)) < wall_prob).astype(np.uint8)
+                # Ensure start and goal are open
+                if r0 == 0:
+                    rows[0, 0] = 0
+                if r0 + len(rows) == n:
+                    rows[-1, n - 1] = 0
+                f.write(np.packbits(rows, axis=1).tobytes())
+            if max_cost > 1:
+                # Costs come from their own stream, one child generator per row, so
+                # neither they nor the walls depend on block_cells (only on the seed)
+                row_seeds = seed_seq.spawn(1)[0]
+                for r0 in range(0, n, block_rows):
+                    rows = np.empty((min(block_rows, n - r0), n), dtype=np.uint8)
+                    for row, row_seed in zip(rows, row_seeds.spawn(len(rows))):
+                        row[:] = np.random.default_rng(row_seed).integers(1, max_cost + 1, size=n, dtype=np.uint8)
+                    f.write(rows.tobytes())
+
+        return cls.open(path)
+
+    def trace_path(self, parent, start, goal):
+        """
+        Rebuilds the (row, col) path from a flat parent table.
+        parent[i] == -1 means unreached; the start cell is its own parent.
+        """
+        if parent[goal] == -1:
+            return []
+
+        path = []
+        cur = goal
+        while True:
+            path.append(divmod(cur, self.n))
+            if cur == start:
+                break
+            cur = parent[cur]
+        path.reverse()
+        return path
+
+    def _window(self, top, left, rows, cols):
+        """Cells of one rectangle as a uint8 array, unpacking only those rows for mapped mazes."""
+        if self._packed is not None:
+            bits = np.unpackbits(self._packed[top:top + rows], axis=1, count=left + cols)
+            return bits[:, left:]
+        return self.as_array()[top:top + rows, left:left + cols]
+
+    def render(self, path=None, viewport=None, max_width=160):
+        """
+        Text picture of the maze, or of viewport=(top, left, rows, cols), which
+        is clipped to the grid but must start inside it (else ValueError):
+        '0' open, '1' wall, '*' path, space-separated, one line per row.
+        When a line would be wider than max_width characters (None = never),
+        each character instead summarizes an f x f block: '*' if the path
+        crosses it, else a shade from ' ' (no walls) to '█' (all walls).
+        """
+        top, left, rows, cols = viewport if viewport is not None else (0, 0, self.n, self.n)
+        if not (0 <= top < self.n and 0 <= left < self.n and rows > 0 and cols > 0):
+            raise ValueError(f"Viewport {viewport} is outside the {self.n}x{self.n} maze")
+        rows = min(rows, self.n - top)
+        cols = min(cols, self.n - left)
+
+        # Path cells inside the window, in window coordinates
+        marks = np.zeros((0, 2), dtype=np.int64)
         if path:
-            for x, y in path:
-                # Check bounds to ensure path is valid before marking
-                if 0 <= x < self.n and 0 <= y < self.n:
-                    maze_copy[x][y] = "*"
-
-        for row in maze_copy:
-            print(" ".join(str(cell) for cell in row))
-        print()
\ No newline at end of file
+            marks = np.asarray(path, dtype=np.int64).reshape(-1, 2) - (top, left)
+            marks = marks[((marks >= 0) & (marks < (rows, cols))).all(axis=1)]
+
+        if max_width is None or 2 * cols - 1 <= max_width:
+            # Byte buffer: cells at even columns, spaces between, newline at the end
+            out = np.full((rows, 2 * cols), ord(" "), dtype=np.uint8)
+            out[:, 0::2] = self._window(top, left, rows, cols) + ord("0")
+            out[:, -1] = ord("\n")
+            out[marks[:, 0], 2 * marks[:, 1]] = ord("*")
+            return out.tobytes().decode("ascii")
+
+        # Summary: wall share per f x f block, read f rows at a time
+        f = -(-cols // max_width)
+        block_cols = -(-cols // f)
+        walls = np.zeros((-(-rows // f), block_cols), dtype=np.int64)
+        area = np.zeros_like(walls)
+        width = np.full(block_cols, f)
+        width[-1] = cols - f * (block_cols - 1)
+        for i, r0 in enumerate(range(0, rows, f)):
+            band = self._window(top + r0, left, min(f, rows - r0), cols)
+            padded = np.zeros((band.shape[0], block_cols * f), dtype=np.int64)
+            padded[:, :cols] = band
+            walls[i] = padded.reshape(band.shape[0], block_cols, f).sum(axis=(0, 2))
+            area[i] = band.shape[0] * width
+
+        codes = (walls * (len(SHADES) - 1) + area // 2) // area
+        codes[marks[:, 0] // f, marks[:, 1] // f] = len(SHADES)
+        chars = np.array(list(SHADES + "*"))
+        return "".join("".join(line) + "\n" for line in chars[codes])
+
+    def print_maze(self, path=None, viewport=None, max_width=160, file=None):
+        """
+        Prints the maze to the console, optionally marking a path, in a single
+        write (see render for viewport / max_width; large mazes are summarized).
+        """
+        (file or sys.stdout).write(self.render(path, viewport, max_width) + "\n")
+
+
+def label_components(is_open, block=None):
+    """
+    Labels the 4-connected regions of a 2-D boolean array of open cells.
+    Returns an int32 array of the same shape: 0 for walls, 1..k for regions.
+    With block=b, moves never cross the edges of the b x b blocks, so every
+    block is labeled on its own (HPAStar's clusters).
+
+    Horizontal runs of open cells are found by a scanline pass, then joined by
+    a vectorized union-find over vertically touching runs. Every round hooks
+    each root onto the smallest root across its edges and pointer-jumps until
+    each run points at a root.
+    """
+    rows, cols = is_open.shape
+
+    # Scanline pass: each horizontal run of open cells is one node
+    starts = is_open.copy()
+    starts[:, 1:] &= ~is_open[:, :-1]
+    if block:
+        starts[:, ::block] = is_open[:, ::block]
+    run = np.cumsum(starts.reshape(-1), dtype=np.int64).reshape(rows, cols) - 1
+    runs = int(starts.sum())
+
+    # Runs touching vertically are connected
+    down = is_open[:-1, :] & is_open[1:, :]
+    if block:
+        down[block - 1::block, :] = False
+    u, v = run[:-1, :][down], run[1:, :][down]
+
+    root = _join_roots(np.arange(runs, dtype=np.int64), u, v)
+
+    # Renumber the roots 1..k, walls 0
+    labels = np.zeros((rows, cols), dtype=np.int32)
+    if runs:
+        labels[is_open] = (np.unique(root, return_inverse=True)[1] + 1)[run[is_open]]
+    return labels
+
+
+def _join_roots(root, u, v):
+    """
+    Vectorized union-find: joins nodes u[i] and v[i] for every edge and
+    returns root with each node pointing at the smallest node of its component.
+    """
+    while u.size:
+        ru, rv = root[u], root[v]
+        split = ru != rv
+        # Edges already inside one component never matter again
+        u, v, ru, rv = u[split], v[split], ru[split], rv[split]
+        np.minimum.at(root, np.maximum(ru, rv), np.minimum(ru, rv))
+        while True:
+            jumped = root[root]
+            if np.array_equal(jumped, root):
+                break
+            root = jumped
+    return root
+
+
+def _file_header(n, wall_prob, seed, max_cost=1):
+    header = FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION, n, wall_prob, -1 if seed is None else seed, max_cost)
+    return header.ljust(FILE_HEADER_SIZE, b"\0")
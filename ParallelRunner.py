@@ -0,0 +1,130 @@
+import importlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from Maze import Maze
+from SearchStats import expansion_heatmap
+
+# (label, solver class, constructor kwargs) in the same order as Visualizer.main.
+# Each solver class lives in the module of the same name.
+DEFAULT_ALGORITHMS = [
+    ("BFS", "BFS", {}),
+    ("DFS", "DFS", {}),
+    ("UCS", "UCS", {}),
+    ("A* (Manhattan)", "AStarSearch", {"heuristic_type": "manhattan"}),
+    ("JPS", "JPS", {}),
+    ("IDS", "IDS", {}),
+    ("Greedy BFS", "GreedyBFS", {}),
+    ("Hill Climbing", "HillClimbing", {}),
+    ("Genetic Algo", "GeneticAlgorithm", {"population_size": 100, "generations": 200}),
+]
+
+# ----------------- Worker side -----------------
+
+# Mazes rebuilt once per worker process by _init_worker
+_worker_mazes = []
+
+def _init_worker(packed_mazes):
+    """Runs once in every worker: unpacks the shared mazes so jobs only carry an index."""
+    global _worker_mazes
+    _worker_mazes = []
+    for packed in packed_mazes:
+        _worker_mazes.append(Maze.from_packed(*packed))
+
+def _call_job(fn, maze_index, args):
+    return fn(_worker_mazes[maze_index], *args)
+
+def solve_job(maze, label, class_name, kwargs, start, goal):
+    """
+    Runs one solver on one maze. Timing is taken inside the worker around
+    solve() only, after the maze's neighbor table and component labels are built.
+    Returns (label, (path, nodes_explored, seconds)).
+    """
+    solver_class = getattr(importlib.import_module(class_name), class_name)
+    solver = solver_class(maze, **kwargs)
+    maze.adjacency()
+    maze.components()
+
+    t0 = time.perf_counter()
+    path, nodes = solver.solve(start, goal)
+    elapsed = time.perf_counter() - t0
+    return label, (path, nodes, elapsed)
+
+def heatmap_job(maze, label, class_name, kwargs, start, goal):
+    """
+    Counts one solver's expansions per cell (SearchStats.expansion_heatmap).
+    Returns (label, n x n counts), or (label, None) for solvers without an
+    event stream.
+    """
+    solver_class = getattr(importlib.import_module(class_name), class_name)
+    solver = solver_class(maze, **kwargs)
+    return label, expansion_heatmap(solver, start, goal)
+
+# ----------------- Parent side -----------------
+
+class ParallelRunner:
+    """
+    Distributes (maze, algorithm, params) jobs over a ProcessPoolExecutor.
+    Every maze is sent to each worker once, bit-packed, through the pool
+    initializer, so individual jobs never re-pickle a grid.
+    """
+
+    def __init__(self, mazes, max_workers=None):
+        self.mazes = list(mazes)
+        self.max_workers = max_workers or os.cpu_count()
+        packed_mazes = [maze.to_packed() for maze in self.mazes]
+        self.executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                            initializer=_init_worker,
+                                            initargs=(packed_mazes,))
+
+    def map(self, fn, jobs):
+        """
+        Runs fn(maze, *args) for every (maze_index, args) job in the pool.
+        fn must be a module-level function; results come back in job order.
+        """
+        futures = [self.executor.submit(_call_job, fn, maze_index, tuple(args))
+                   for maze_index, args in jobs]
+        return [future.result() for future in futures]
+
+    def solve_all(self, algorithms=None, start=(0, 0), goal=None):
+        """
+        Runs every algorithm on every maze. Returns one dict per maze in the
+        shape plot_static_comparison expects: {label: (path, nodes, seconds)}.
+        """
+        algorithms = algorithms or DEFAULT_ALGORITHMS
+        jobs = []
+        for maze_index, maze in enumerate(self.mazes):
+            maze_goal = goal if goal is not None else (maze.n - 1, maze.n - 1)
+            for label, class_name, kwargs in algorithms:
+                jobs.append((maze_index, (label, class_name, kwargs, start, maze_goal)))
+
+        outputs = self.map(solve_job, jobs)
+
+        results = [{} for _ in self.mazes]
+        for (maze_index, _), (label, result) in zip(jobs, outputs):
+            results[maze_index][label] = result
+        return results
+
+    def close(self):
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def run_parallel(maze, algorithms=None, start=(0, 0), goal=None, max_workers=None):
+    """Convenience wrapper: all algorithms on one maze, results as {label: (path, nodes, seconds)}."""
+    with ParallelRunner([maze], max_workers) as runner:
+        return runner.solve_all(algorithms, start, goal)[0]
+
+def expansion_heatmaps(maze, algorithms=None, start=(0, 0), goal=None, max_workers=None):
+    """All algorithms on one maze, results as {label: per-cell expansion counts or None}."""
+    algorithms = algorithms or DEFAULT_ALGORITHMS
+    if goal is None:
+        goal = (maze.n - 1, maze.n - 1)
+    jobs = [(0, (label, class_name, kwargs, start, goal)) for label, class_name, kwargs in algorithms]
+    with ParallelRunner([maze], max_workers) as runner:
+        return dict(runner.map(heatmap_job, jobs))
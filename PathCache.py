@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+import sys
+from collections import OrderedDict
+
+class PathCache:
+    """
+    Caches solver results: (maze fingerprint, algorithm, params, start, goal) -> (path, nodes_explored).
+    The in-memory tier is an LRU bounded by an approximate byte budget; an optional
+    on-disk tier (one small JSON file per query) survives restarts.
+    Because the key contains Maze.fingerprint(), editing the maze through
+    Maze.set_cell automatically makes old entries unreachable.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, directory=None):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (path, nodes_explored, size)
+
+        if self.directory and not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+
+    def make_key(self, solver, start, goal):
+        """Builds the lookup key for one query on one solver."""
+        # Solver settings are its plain public attributes (heuristic_type, mode, ...)
+        params = tuple(sorted(
+            (name, value) for name, value in vars(solver).items()
+            if not name.startswith("_") and isinstance(value, (bool, int, float, str))
+        ))
+        return (solver.maze_obj.fingerprint(), type(solver).__name__, params, tuple(start), tuple(goal))
+
+    def _entry_size(self, path):
+        """Approximate memory held by one cached path."""
+        return sys.getsizeof(path) + len(path) * sys.getsizeof((0, 0)) + 200
+
+    def _disk_file(self, key):
+        name = hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+        return os.path.join(self.directory, name + ".json")
+
+    def get(self, key):
+        """Returns (path, nodes_explored) or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(entry[0]), entry[1]
+
+        if self.directory:
+            filename = self._disk_file(key)
+            if os.path.exists(filename):
+                with open(filename) as f:
+                    data = json.load(f)
+                path = [tuple(cell) for cell in data["path"]]
+                # Promote to the memory tier for the next lookup
+                self._remember(key, path, data["nodes_explored"])
+                self.hits += 1
+                return list(path), data["nodes_explored"]
+
+        self.misses += 1
+        return None
+
+    def put(self, key, path, nodes_explored):
+        """Stores a result in memory (and on disk if a directory was given)."""
+        path = [tuple(cell) for cell in path]
+        self._remember(key, path, nodes_explored)
+
+        if self.directory:
+            with open(self._disk_file(key), "w") as f:
+                json.dump({"path": path, "nodes_explored": nodes_explored}, f)
+
+    def _remember(self, key, path, nodes_explored):
+        size = self._entry_size(path)
+        if size > self.max_bytes:
+            return
+
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.current_bytes -= old[2]
+        self._entries[key] = (path, nodes_explored, size)
+        self.current_bytes += size
+
+        # Evict least recently used entries until we are back under budget
+        while self.current_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.current_bytes -= evicted[2]
+
+    def solve(self, solver, start=(0, 0), goal=None):
+        """Drop-in for solver.solve(start, goal) that answers repeated queries from the cache."""
+        if goal is None:
+            goal = (solver.n - 1, solver.n - 1)
+
+        key = self.make_key(solver, start, goal)
+        result = self.get(key)
+        if result is None:
+            result = solver.solve(start, goal)
+            self.put(key, *result)
+        return result
+
+    def clear(self):
+        """Empties the memory tier (disk files are left in place)."""
+        self._entries.clear()
+        self.current_bytes = 0
+
+
+class CachedSolver:
+    """Wraps any solver so its solve() goes through a PathCache."""
+
+    def __init__(self, solver, cache):
+        self.solver = solver
+        self.cache = cache
+        self.maze_obj = solver.maze_obj
+        self.n = solver.n
+
+    def solve(self, start=(0, 0), goal=None):
+        return self.cache.solve(self.solver, start, goal)
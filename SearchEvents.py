@@ -0,0 +1,48 @@
+# Search event stream: solvers with an events(start, goal) generator yield
+# (kind, payload) tuples while they search, nothing is stored.
+#   (PUSH, (row, col))    a cell was added to the open set / frontier
+#   (EXPAND, (row, col))  a cell was taken off it and expanded
+#   (STALE, (row, col))   an outdated entry was taken off it and skipped
+#   (GOAL, path)          the goal was reached; path is the final path
+# The stream simply ends without a GOAL event when the search fails.
+# solve() and events() drive the same search generator, _search(start, goal, emit):
+# it only yields when emit is set, and returns (path, nodes_explored), so solve()
+# pays one flag test per step (see run_search).
+PUSH = "push"
+EXPAND = "expand"
+STALE = "stale"
+GOAL = "goal"
+
+# Solver settings that replace the plain cell-level search; events() only streams that one
+SEARCH_VARIANTS = {"mode": "queue", "bidirectional": False, "graph": False, "reuse_depths": False}
+
+def run_search(search):
+    """Runs a search generator built with emit=False to the end and returns its result."""
+    try:
+        next(search)
+    except StopIteration as done:
+        return done.value
+    raise RuntimeError("search built with emit=False yielded an event")
+
+def streams(solver):
+    """True when solver.events() replays exactly what solver.solve() runs."""
+    if not hasattr(solver, "events"):
+        return False
+    return all(getattr(solver, name, plain) == plain for name, plain in SEARCH_VARIANTS.items())
+
+def search_events(solver, start=(0, 0), goal=None):
+    """
+    Event stream of one query on any solver. Solvers without an events()
+    stream for their current settings (Genetic, HPAStar, bidirectional or
+    graph modes, ...) are solved normally and their final path is replayed
+    as EXPAND events.
+    """
+    if streams(solver):
+        yield from solver.events(start, goal)
+        return
+
+    path, _ = solver.solve(start, goal)
+    for cell in path:
+        yield (EXPAND, cell)
+    if path:
+        yield (GOAL, path)
@@ -0,0 +1,159 @@
+import random
+import time
+import tracemalloc
+from array import array
+
+import numpy as np
+
+from SearchEvents import PUSH, EXPAND, STALE, GOAL, streams
+
+class SearchStats:
+    """
+    Instrumentation for one solve() call, returned as the third element by
+    solve(start, goal, stats=True). Counts the event stream (see
+    SearchEvents) when the solver has one for its current settings; other
+    solvers only report the timing, memory and their own nodes_explored,
+    and the counters stay None.
+
+    expansions    cells taken off the frontier and expanded
+    pushes        cells added to the frontier (including re-pushes)
+    stale_pops    frontier entries dropped on pop (already expanded / superseded)
+    peak_frontier largest number of entries waiting in the frontier
+    peak_memory   peak bytes allocated by a solve() call (tracemalloc)
+    timings       seconds of a plain solve(): "total", and for streamed
+                  solvers "path" (reconstruction) and "search" (the rest)
+    unit          what nodes_explored counts for this solver
+    heatmap       n x n array of expansions per cell (measure(heatmap=True) only,
+                  see also expansion_heatmap)
+    """
+
+    def __init__(self, algorithm, unit="cells expanded"):
+        self.algorithm = algorithm
+        self.unit = unit
+        self.nodes_explored = 0
+        self.path_length = 0
+        self.expansions = None
+        self.pushes = None
+        self.stale_pops = None
+        self.peak_frontier = None
+        self.peak_memory = None
+        self.timings = {}
+        self.heatmap = None
+
+    def as_dict(self):
+        return dict(vars(self))
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={value!r}" for name, value in vars(self).items()
+                           if name != "heatmap")
+        return f"SearchStats({fields})"
+
+    @classmethod
+    def measure(cls, solver, start=(0, 0), goal=None, heatmap=False):
+        """
+        Runs one query on solver and returns (path, nodes_explored, stats).
+
+        Each figure comes from its own run, so no instrumentation leaks into
+        another: the timing from a plain solve(), the counters (and, with
+        heatmap=True, the expansions per cell) from an untraced pass over
+        the event stream, and peak_memory from a solve() under tracemalloc.
+        The random state is rewound before every run, so randomized solvers
+        repeat the same search, and solvers that keep work between queries
+        (BFS's distance field, A*'s heuristic table, HPAStar's abstraction,
+        IDS's buffers) drop it through clear_cache(), so every run starts
+        cold. The maze's own tables (adjacency, components, ...) are shared
+        precomputation and stay built. Solvers whose solve() keeps state that
+        cannot be reset (stats_repeatable = False) are only timed.
+        """
+        stats = cls(type(solver).__name__, getattr(solver, "stats_unit", "cells expanded"))
+        state = random.getstate()
+
+        _start_cold(solver)
+        t0 = time.perf_counter()
+        path, nodes_explored = solver.solve(start, goal)
+        stats.timings["total"] = time.perf_counter() - t0
+        stats.nodes_explored = nodes_explored
+        stats.path_length = len(path)
+
+        if not getattr(solver, "stats_repeatable", True):
+            return path, nodes_explored, stats
+
+        if streams(solver):
+            random.setstate(state)
+            _start_cold(solver)
+            cls._count_events(solver, start, goal, stats, heatmap)
+
+        random.setstate(state)
+        _start_cold(solver)
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+        else:
+            tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        solver.solve(start, goal)
+        stats.peak_memory = tracemalloc.get_traced_memory()[1] - baseline
+        if not tracing:
+            tracemalloc.stop()
+
+        return path, nodes_explored, stats
+
+    @staticmethod
+    def _count_events(solver, start, goal, stats, heatmap=False):
+        n = solver.n
+        counts = _new_counts(n) if heatmap else None
+        expansions = pushes = stale = peak = 0
+        last_expand = None
+        for kind, payload in solver.events(start, goal):
+            if kind == PUSH:
+                pushes += 1
+                waiting = pushes - expansions - stale
+                if waiting > peak:
+                    peak = waiting
+            elif kind == EXPAND:
+                expansions += 1
+                if counts is not None:
+                    counts[payload[0] * n + payload[1]] += 1
+                # Reconstruction runs between the last expansion and GOAL
+                last_expand = time.perf_counter()
+            elif kind == STALE:
+                stale += 1
+            elif kind == GOAL:
+                path_time = time.perf_counter() - last_expand
+                total = stats.timings["total"]
+                stats.timings["path"] = min(path_time, total)
+                stats.timings["search"] = total - stats.timings["path"]
+
+        stats.expansions, stats.pushes = expansions, pushes
+        stats.stale_pops, stats.peak_frontier = stale, peak
+        if counts is not None:
+            stats.heatmap = _as_grid(counts, n)
+
+def expansion_heatmap(solver, start=(0, 0), goal=None):
+    """
+    Expansions per cell of one query as an n x n int array, from a single
+    untraced pass over solver.events() (no timing or memory runs, unlike
+    SearchStats.measure). Re-expansions, e.g. one per IDS iteration, add up
+    on the same cell. None when the solver has no event stream for its
+    current settings.
+    """
+    if not streams(solver):
+        return None
+    n = solver.n
+    counts = _new_counts(n)
+    for kind, payload in solver.events(start, goal):
+        if kind == EXPAND:
+            counts[payload[0] * n + payload[1]] += 1
+    return _as_grid(counts, n)
+
+def _start_cold(solver):
+    clear_cache = getattr(solver, "clear_cache", None)
+    if clear_cache is not None:
+        clear_cache()
+
+def _new_counts(n):
+    # array('i') increments are much cheaper than NumPy scalar indexing in the event loop
+    return array('i', [0]) * (n * n)
+
+def _as_grid(counts, n):
+    return np.frombuffer(counts, dtype=np.intc).reshape(n, n)
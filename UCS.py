@@ -1,59 +1,120 @@
-import heapq
+from array import array
+
+from BatchSolve import solve_many
+from SearchEvents import PUSH, EXPAND, STALE, GOAL, run_search
+from SearchStats import SearchStats
 
 class UCS:
-    def __init__(self, maze):
-        self.maze = maze.grid
+    """
+    Uniform Cost Search (Dijkstra) on the maze's terrain costs: stepping onto a
+    cell costs maze.costs[cell] (1 everywhere for unweighted mazes).
+    Costs are small integers, so instead of a binary heap the open set is a
+    Dial bucket queue: a ring of max_cost + 1 buckets, bucket d % (max_cost + 1)
+    holding the cells whose tentative cost is d. Push and pop are O(1).
+    """
+
+    def __init__(self, maze, graph=False):
+        self.maze_obj = maze
         self.n = maze.n
+        # Search the junction graph (corridors collapsed) instead of single cells
+        self.graph = graph
+
+    def solve(self, start=(0, 0), goal=None, stats=False):
+        # Opt-in instrumentation: returns (path, nodes_explored, SearchStats). Runs the query
+        # up to three times: a timed solve(), an events() pass for the counters and a
+        # traced solve() for memory (see SearchStats.measure)
+        if stats:
+            return SearchStats.measure(self, start, goal)
 
-    def solve(self, start=(0, 0), goal=None):
         if goal is None:
             goal = (self.n - 1, self.n - 1)
 
-        # Priority Queue stores tuples: (cost, (x, y))
-        # UCS selects the node with the lowest path cost so far (g)
-        open_set = []
-        heapq.heappush(open_set, (0, start))
+        # Start and goal in different connected components: nothing to search
+        if not self.maze_obj.reachable(start, goal):
+            return [], 0
 
-        came_from = {start: None}
-        cost_so_far = {start: 0}
-        nodes_explored = 0
-        visited = set()
+        if self.graph:
+            graph = self.maze_obj.junction_graph()
+            return graph.search(self.maze_obj.index(start), self.maze_obj.index(goal), use_costs=True)
+
+        return run_search(self._search(start, goal))
+
+    def solve_many(self, pairs):
+        """
+        Answers many (start, goal) queries at once: queries sharing a start or
+        goal share one multi-target Dijkstra on the terrain costs (see
+        BatchSolve.solve_many). Returns [(path, nodes_explored)] in input order.
+        """
+        return solve_many(self.maze_obj, pairs, use_costs=True)
+
+    def events(self, start=(0, 0), goal=None):
+        """The cell-level solve() as a lazy stream of (kind, cell) events (see SearchEvents)."""
+        if goal is None:
+            goal = (self.n - 1, self.n - 1)
+        if not self.maze_obj.reachable(start, goal):
+            return
+        yield from self._search(start, goal, emit=True)
 
-        while open_set:
-            # Pop the node with the lowest cost
-            current_cost, current = heapq.heappop(open_set)
+    def _search(self, start, goal, emit=False):
+        """The bucket-queue search behind solve() and events(); yields events only with emit."""
+        offsets, neighbors = self.maze_obj.adjacency()
+        costs = self.maze_obj.costs
+        n = self.n
+        s = self.maze_obj.index(start)
+        g = self.maze_obj.index(goal)
+        size = n * n
 
-            # Skip if we've already processed this node (Lazy Deletion handling)
-            if current in visited:
-                continue
-            visited.add(current)
-            nodes_explored += 1
+        # Every push lands at most max_cost ahead of the cost being expanded,
+        # so max_cost + 1 buckets never collide
+        width = self.maze_obj.max_cost + 1
+        buckets = [[] for _ in range(width)]
+        buckets[0].append(s)
+        pending = 1
+
+        came_from = array('i', [-1]) * size
+        came_from[s] = s
+        # -1 marks "not seen yet"
+        cost_so_far = array('q', [-1]) * size
+        cost_so_far[s] = 0
+        nodes_explored = 0
+        current_cost = 0
+        if emit:
+            yield (PUSH, start)
 
-            if current == goal:
-                break
+        while pending:
+            bucket = buckets[current_cost % width]
+            while bucket:
+                current = bucket.pop()
+                pending -= 1
 
-            x, y = current
-            for dx, dy in [(1,0), (-1,0), (0,1), (0,-1)]:
-                nx, ny = x + dx, y + dy
+                # Stale entry: the cell was re-pushed later with a lower cost
+                # (also covers cells already expanded at that lower cost)
+                if cost_so_far[current] != current_cost:
+                    if emit:
+                        yield (STALE, divmod(current, n))
+                    continue
+                nodes_explored += 1
+                if emit:
+                    yield (EXPAND, divmod(current, n))
 
-                # Check bounds and walls
-                if 0 <= nx < self.n and 0 <= ny < self.n and self.maze[nx][ny] == 0:
-                    new_cost = current_cost + 1
-                    
+                if current == g:
+                    path = self.maze_obj.trace_path(came_from, s, g)
+                    if emit:
+                        yield (GOAL, path)
+                    return path, nodes_explored
+
+                for nxt in neighbors[offsets[current]:offsets[current + 1]]:
+                    new_cost = current_cost + costs[nxt]
                     # If we found a cheaper path to this neighbor (or haven't seen it yet)
-                    if (nx, ny) not in cost_so_far or new_cost < cost_so_far[(nx, ny)]:
-                        cost_so_far[(nx, ny)] = new_cost
-                        came_from[(nx, ny)] = current
-                        # Push to priority queue with the new cost
-                        heapq.heappush(open_set, (new_cost, (nx, ny)))
-
-        # Reconstruct path
-        path = []
-        cur = goal
-        if cur in came_from:
-            while cur is not None:
-                path.append(cur)
-                cur = came_from[cur]
-            path.reverse()
-        
-        return path, nodes_explored
\ No newline at end of file
+                    known = cost_so_far[nxt]
+                    if known == -1 or new_cost < known:
+                        cost_so_far[nxt] = new_cost
+                        came_from[nxt] = current
+                        buckets[new_cost % width].append(nxt)
+                        pending += 1
+                        if emit:
+                            yield (PUSH, divmod(nxt, n))
+
+            current_cost += 1
+
+        return [], nodes_explored
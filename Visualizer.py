@@ -1,181 +1,399 @@
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
 import matplotlib.colors as mcolors
 import numpy as np
-import time
+import importlib
 import os
+from concurrent.futures import ProcessPoolExecutor
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PIL import GifImagePlugin, Image
 
 # Import your existing classes
 from Maze import Maze
-from BFS import BFS
-from DFS import DFS
-from AStarSearch import AStarSearch
-from IDS import IDS
-from HillClimbing import HillClimbing
-from GeneticAlgorithm import GeneticAlgorithm
-from GreedyBFS import GreedyBFS
-from UCS import UCS
+from ParallelRunner import run_parallel, expansion_heatmaps
+from SearchEvents import search_events, PUSH, EXPAND, GOAL
 
-def get_visualization_grid(maze_obj, path=None):
+# Static comparison colors by grid code: [Path, Wall, PathTrace, Start, Goal]
+STATIC_CMAP = mcolors.ListedColormap(['white', 'black', 'deepskyblue', 'lime', 'red'])
+STATIC_NORM = mcolors.BoundaryNorm([-0.5, 0.5, 1.5, 2.5, 3.5, 4.5], STATIC_CMAP.N)
+# Heatmap panels: walls under the expansion counts (unexpanded cells stay white)
+WALL_CMAP = mcolors.ListedColormap(['white', 'black'])
+HEATMAP_CMAP = "inferno_r"
+
+def get_visualization_grid(maze_obj, path=None, max_size=None):
     """
     Converts the maze grid into a color map for matplotlib.
+    Codes: 0=Path (open), 1=Wall, 2=PathTrace, 3=Start, 4=Goal.
+    With max_size, larger grids are shrunk by downsample_grid.
     """
-    grid = np.array(maze_obj.grid)
-    vis_grid = np.zeros_like(grid)
-    
-    # Map: Wall=1, Path=0
-    # For visualization: 0=White(Path), 1=Black(Wall)
-    vis_grid[grid == 1] = 1 
-    vis_grid[grid == 0] = 0
+    # Map: Wall=1, Path=0 (already the cell values)
+    vis_grid = maze_obj.as_array().astype(np.uint8)
 
     if path:
-        for (r, c) in path:
-            if 0 <= r < maze_obj.n and 0 <= c < maze_obj.n:
-                vis_grid[r][c] = 2 # Path color
+        # All path cells in one fancy-indexing assignment
+        cells = np.asarray(path, dtype=np.int64).reshape(-1, 2)
+        cells = cells[((cells >= 0) & (cells < maze_obj.n)).all(axis=1)]
+        vis_grid[cells[:, 0], cells[:, 1]] = 2 # Path color
 
     # Mark Start and Goal
-    start = (0, 0)
-    goal = (maze_obj.n - 1, maze_obj.n - 1)
-    vis_grid[start] = 3
-    vis_grid[goal] = 4
+    vis_grid[0, 0] = 3
+    vis_grid[-1, -1] = 4
 
+    if max_size is not None:
+        vis_grid = downsample_grid(vis_grid, max_size)
     return vis_grid
 
-def plot_static_comparison(maze, results):
+def downsample_grid(vis_grid, max_size):
+    """
+    Shrinks a code grid to at most max_size cells per side, pooling f x f
+    blocks. Path, start and goal are max-pooled, so a one-cell-wide trace
+    stays visible at any scale; a block is a wall when most of it is wall
+    (max-pooling walls too would paint any porous maze solid black).
+    """
+    n = vis_grid.shape[0]
+    f = -(-n // max_size)
+    if f <= 1:
+        return vis_grid
+
+    size = -(-n // f) * f
+    padded = np.zeros((size, size), dtype=np.uint8)
+    padded[:n, :n] = vis_grid
+    blocks = padded.reshape(size // f, f, size // f, f)
+    marks = blocks.max(axis=(1, 3))
+    walls = np.count_nonzero(blocks == 1, axis=(1, 3)) * 2 >= f * f
+    return np.where(marks >= 2, marks, walls.astype(np.uint8))
+
+def render_panel(vis_grid, title_text):
+    """Renders one algorithm's panel to an RGB array (runs in a worker process)."""
+    fig = Figure(figsize=(4, 4))
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.imshow(vis_grid, cmap=STATIC_CMAP, norm=STATIC_NORM, interpolation='nearest')
+    ax.set_title(title_text, fontsize=10)
+    ax.axis('off')
+    fig.tight_layout()
+    canvas.draw()
+    return np.asarray(canvas.buffer_rgba())[:, :, :3].copy()
+
+def downsample_heatmap(counts, max_size):
+    """Shrinks a per-cell count grid like downsample_grid, summing each f x f block."""
+    n = counts.shape[0]
+    f = -(-n // max_size)
+    if f <= 1:
+        return counts
+
+    size = -(-n // f) * f
+    padded = np.zeros((size, size), dtype=np.int64)
+    padded[:n, :n] = counts
+    return padded.reshape(size // f, f, size // f, f).sum(axis=(1, 3))
+
+def render_heatmap_panel(counts, walls, title_text, vmax):
+    """Renders one algorithm's expansion heatmap to an RGB array (runs in a worker process)."""
+    fig = Figure(figsize=(4, 4))
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.imshow(walls, cmap=WALL_CMAP, vmin=0, vmax=1, interpolation='nearest')
+    # Log scale: IDS re-expands cells near the start orders of magnitude more than the rest
+    image = ax.imshow(np.ma.masked_equal(counts, 0), cmap=HEATMAP_CMAP,
+                      norm=mcolors.LogNorm(vmin=1, vmax=max(vmax, 2)), interpolation='nearest')
+    fig.colorbar(image, ax=ax, fraction=0.046, pad=0.04)
+    ax.set_title(title_text, fontsize=10)
+    ax.axis('off')
+    fig.tight_layout()
+    canvas.draw()
+    return np.asarray(canvas.buffer_rgba())[:, :, :3].copy()
+
+def render_sheet(render, panels, heading, filename, executor=None):
     """
-    Plots a grid of subplots showing the solution for each algorithm.
+    Renders render(*args) for every args tuple in panels in a process pool
+    and saves the tiles 4 per row under a heading band.
     """
-    num_algos = len(results)
+    columns = list(zip(*panels))
+    if executor is None:
+        with ProcessPoolExecutor(max_workers=min(len(panels), os.cpu_count() or 1)) as pool:
+            tiles = list(pool.map(render, *columns))
+    else:
+        tiles = list(executor.map(render, *columns))
+
+    # Composite: a title band, then the tiles 4 per row
     cols = 4
-    rows = (num_algos + cols - 1) // cols
-    
-    fig, axes = plt.subplots(rows, cols, figsize=(16, 4 * rows))
-    fig.suptitle(f"Algorithm Comparison (Maze Size: {maze.n}x{maze.n})", fontsize=16)
-    
-    # Custom colormap: [Path, Wall, PathTrace, Start, Goal]
-    # Colors: White, Black, Blue, Green, Red
-    cmap = mcolors.ListedColormap(['white', 'black', 'deepskyblue', 'lime', 'red'])
-    bounds = [-0.5, 0.5, 1.5, 2.5, 3.5, 4.5]
-    norm = mcolors.BoundaryNorm(bounds, cmap.N)
+    rows = (len(tiles) + cols - 1) // cols
+    tile_h, tile_w = tiles[0].shape[:2]
+
+    header = Figure(figsize=(cols * tile_w / 100, 0.6))
+    header_canvas = FigureCanvasAgg(header)
+    header.text(0.5, 0.5, heading, ha="center", va="center", fontsize=16)
+    header_canvas.draw()
+    band = np.asarray(header_canvas.buffer_rgba())[:, :, :3]
 
-    axes_flat = axes.flatten() if num_algos > 1 else [axes]
+    sheet = np.full((band.shape[0] + rows * tile_h, cols * tile_w, 3), 255, dtype=np.uint8)
+    sheet[:band.shape[0], :band.shape[1]] = band
+    for i, tile in enumerate(tiles):
+        top = band.shape[0] + (i // cols) * tile_h
+        left = (i % cols) * tile_w
+        sheet[top:top + tile_h, left:left + tile_w] = tile
 
-    for i, (name, result) in enumerate(results.items()):
+    Image.fromarray(sheet).save(filename)
+
+def plot_static_comparison(maze, results, filename="Images/All_Algorithms_Solved.png",
+                           max_size=400, executor=None):
+    """
+    Saves a grid of panels showing the solution for each algorithm.
+    Panels are rendered in a process pool and composited into one image;
+    pass a long-lived ProcessPoolExecutor as executor when rendering many
+    mazes, to avoid starting a pool per call. Mazes larger than max_size
+    cells per side are downsampled first.
+    """
+    if not results:
+        print("No results to plot.")
+        return
+
+    panels = []
+    for name, result in results.items():
         path, nodes, exec_time = result
-        ax = axes_flat[i]
-        
-        vis_grid = get_visualization_grid(maze, path)
-        
-        ax.imshow(vis_grid, cmap=cmap, norm=norm)
-        
+
         # Title with stats
         status = "Solved" if path else "Failed"
         if name == "Hill Climbing" and not path: status = "Stuck"
-        
-        title_text = f"{name}\n{status}\nLen: {len(path)} | Exp: {nodes}"
-        ax.set_title(title_text, fontsize=10)
-        ax.axis('off')
+        panels.append((get_visualization_grid(maze, path, max_size),
+                       f"{name}\n{status}\nLen: {len(path)} | Exp: {nodes}"))
+
+    render_sheet(render_panel, panels, f"Algorithm Comparison (Maze Size: {maze.n}x{maze.n})",
+                 filename, executor)
+    print(f"Static comparison saved to '{filename}'")
+
+def plot_heatmap_comparison(maze, heatmaps, filename="Images/Expansion_Heatmaps.png",
+                            max_size=400, executor=None):
+    """
+    Saves per-cell expansion heatmaps side by side, in the same layout as
+    plot_static_comparison. heatmaps maps a label to an n x n count array
+    (see ParallelRunner.expansion_heatmaps). Labels mapped to None (solvers
+    without an event stream, e.g. the Genetic Algorithm, which evaluates
+    whole move sequences rather than cells) get a walls-only panel saying
+    so. All panels share one log color scale, so colors compare across
+    algorithms; mazes larger than max_size cells per side show the
+    expansions summed per block.
+    """
+    if not heatmaps:
+        print("No heatmaps to plot.")
+        return
+
+    walls = get_visualization_grid(maze, None, max_size) == 1
+    pooled = {name: downsample_heatmap(counts, max_size)
+              for name, counts in heatmaps.items() if counts is not None}
+    vmax = max((int(counts.max()) for counts in pooled.values()), default=1)
+    empty = np.zeros(walls.shape, dtype=np.int64)
 
-    # Hide empty subplots
-    for j in range(i + 1, len(axes_flat)):
-        axes_flat[j].axis('off')
+    panels = []
+    for name, counts in heatmaps.items():
+        if counts is None:
+            panels.append((empty, walls, f"{name}\nNo per-cell expansions\n(no event stream)", vmax))
+            continue
+        title = (f"{name}\nExp: {int(counts.sum())} | Cells: {np.count_nonzero(counts)}"
+                 f" | Max: {int(counts.max())}")
+        panels.append((pooled[name], walls, title, vmax))
+
+    render_sheet(render_heatmap_panel, panels, f"Expansions per Cell (Maze Size: {maze.n}x{maze.n})",
+                 filename, executor)
+    print(f"Heatmap comparison saved to '{filename}'")
+
+class GifFrames:
+    """
+    Streams GIF frames straight from an Agg canvas to disk as they are drawn.
+    Each frame is compared with the previous one and only the changed
+    rectangle is written (with its own palette), so memory stays flat and a
+    frame that moves one dot costs a few bytes. A frame identical to the
+    previous one, or hold(), just makes the previous frame last longer.
+    """
 
-    plt.tight_layout()
-    plt.subplots_adjust(top=0.90)
-    plt.savefig("Images/All_Algorithms_Solved.png")
-    print("Static comparison saved to 'Images/All_Algorithms_Solved.png'")
-    # plt.show() 
+    def __init__(self, canvas, filename, fps=15):
+        self.canvas = canvas
+        self.frame_ms = int(1000 / fps)
+        self.file = open(filename, "wb")
+        self.frames = 0
+        self._previous = None
+        # The last grabbed frame is written once its duration is final:
+        # [image, offset, ms, has its own palette]
+        self._pending = None
+
+    def grab(self):
+        """Snapshots the canvas as drawn so far (call canvas.draw() or blit first)."""
+        rgba = np.asarray(self.canvas.buffer_rgba())
+        # One uint32 per pixel: a single comparison finds the changed pixels
+        pixels = rgba.view(np.uint32)[:, :, 0]
+        if self._previous is None:
+            frame = Image.fromarray(rgba[:, :, :3]).quantize()
+            header, _ = GifImagePlugin.getheader(frame, None, {"loop": 0, "duration": self.frame_ms})
+            self.file.write(b"".join(header))
+            offset, local = (0, 0), False
+        else:
+            changed = pixels != self._previous
+            rows = np.flatnonzero(changed.any(axis=1))
+            if not rows.size:
+                self.hold(1)
+                return
+            cols = np.flatnonzero(changed[rows[0]:rows[-1] + 1].any(axis=0))
+            top, left = rows[0], cols[0]
+            patch = rgba[top:rows[-1] + 1, left:cols[-1] + 1, :3]
+            frame = Image.fromarray(np.ascontiguousarray(patch)).quantize()
+            offset, local = (int(left), int(top)), True
+        self._flush()
+        self._previous = pixels.copy()
+        self._pending = [frame, offset, self.frame_ms, local]
+        self.frames += 1
+
+    def hold(self, frames):
+        """Shows the last frame for `frames` more frame intervals."""
+        if self._pending is None:
+            raise RuntimeError("GifFrames.hold() needs a frame: call grab() first")
+        self._pending[2] += frames * self.frame_ms
+
+    def _flush(self):
+        if self._pending is not None:
+            frame, offset, duration, local = self._pending
+            # The first frame uses the global palette from the header
+            self.file.write(b"".join(GifImagePlugin.getdata(frame, offset, duration=duration,
+                                                             include_color_table=local)))
+            self._pending = None
+
+    def close(self):
+        self._flush()
+        self.file.write(b";")
+        self.file.close()
 
 def create_combined_animation(maze, results, algorithm_order):
     """
     Creates a SINGLE video file that plays all algorithms sequentially.
+    Rendering is blitted: each frame draws only the new trail dot and the
+    agent on top of the previous frame, so export time grows linearly with
+    the path lengths.
     """
-    print("Generating combined animation timeline...")
-    
-    # 1. Build the timeline of frames
-    # timeline is a list of dictionaries, where each dict is one frame of the video
-    timeline = []
-    
-    for name in algorithm_order:
-        # Check if this algorithm was run and found a valid path
-        if name in results and results[name][0]: 
-            path = results[name][0]
-            
-            # Add running frames (agent moving)
-            for i in range(len(path)):
-                timeline.append({
-                    "algo": name,
-                    "path_slice": path[:i+1], # Path up to current step
-                    "current_pos": path[i]
-                })
-            
-            # Add PAUSE frames at the end of each algorithm (so viewer can see the result)
-            # 15 frames pause * 60ms interval ~= 1 second pause
-            for _ in range(15): 
-                timeline.append({
-                    "algo": name,
-                    "path_slice": path,
-                    "current_pos": path[-1]
-                })
-
-    if not timeline:
+    print("Generating combined animation...")
+
+    # 15 frames pause * 60ms interval ~= 1 second pause after each algorithm
+    pause_frames = 15
+    solved = [name for name in algorithm_order if name in results and results[name][0]]
+
+    if not solved:
         print("No paths found to animate.")
         return
 
-    # 2. Setup the Plot
-    fig, ax = plt.subplots(figsize=(7, 7))
+    # 1. Setup the Plot on an off-screen Agg canvas (needed for blitting)
+    fig = Figure(figsize=(7, 7))
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
     
     # Static Background (Walls and Empty Space)
-    grid = np.array(maze.grid)
+    grid = maze.as_array()
     cmap = mcolors.ListedColormap(['white', 'black'])
     ax.imshow(grid, cmap=cmap, vmin=0, vmax=1)
-    
-    # Dynamic Elements (Agent, Trail, Title)
-    agent, = ax.plot([], [], 'ro', markersize=12, label='Agent', zorder=5) # Red dot
-    trail, = ax.plot([], [], 'b.', markersize=6, alpha=0.5, zorder=3) # Blue dots
-    
-    # Title Text object (we update this every frame)
-    title_text = ax.text(0.5, 1.02, "", transform=ax.transAxes, ha="center", fontsize=14, fontweight='bold', color='darkblue')
 
     # Goal Marker
     ax.plot(maze.n-1, maze.n-1, 'rx', markersize=12, markeredgewidth=3)
     ax.text(maze.n-1, maze.n-1, ' GOAL', color='red', fontsize=12)
     ax.axis('off')
-
-    def init():
-        agent.set_data([], [])
-        trail.set_data([], [])
-        title_text.set_text("")
-        return agent, trail, title_text
-
-    def update(frame_idx):
-        frame_data = timeline[frame_idx]
-        
-        # Update Title
-        title_text.set_text(f"Algorithm: {frame_data['algo']}")
-        
-        # Update Agent Position
-        # Note: matplotlib plots (x, y), but matrix is [row][col]. So we plot (col, row).
-        r, c = frame_data['current_pos']
-        agent.set_data([c], [r])
-        
-        # Update Trail
-        path = frame_data['path_slice']
-        if path:
-            rs, cs = zip(*path)
-            trail.set_data(cs, rs)
-            
-        return agent, trail, title_text
-
-    print(f"Rendering {len(timeline)} frames... This may take a moment.")
-    
-    # Interval=60ms means ~16 FPS. 
-    ani = animation.FuncAnimation(fig, update, frames=len(timeline), init_func=init, blit=True, interval=60)
     
+    # Dynamic Elements (Agent, newest Trail dot, Title), drawn by hand each frame
+    agent, = ax.plot([], [], 'ro', markersize=12, label='Agent', zorder=5, animated=True) # Red dot
+    trail, = ax.plot([], [], 'b.', markersize=6, alpha=0.5, zorder=3, animated=True) # Blue dots
+    title_text = ax.text(0.5, 1.02, "", transform=ax.transAxes, ha="center", fontsize=14, fontweight='bold', color='darkblue', animated=True)
+
+    canvas.draw()
+    clean = canvas.copy_from_bbox(fig.bbox)
     filename = "Images/Combined_Algorithms.gif"
-    ani.save(filename, writer='pillow', fps=15)
+    gif = GifFrames(canvas, filename)
+
+    # 2. Stream frames: the trail so far lives in `trail_so_far` (a saved
+    # canvas region); every step adds one dot to it, then draws the agent on top
+    total_frames = 0
+    for name in solved:
+        path = results[name][0]
+        canvas.restore_region(clean)
+        title_text.set_text(f"Algorithm: {name}")
+        ax.draw_artist(title_text)
+        trail_so_far = canvas.copy_from_bbox(fig.bbox)
+
+        # Note: matplotlib plots (x, y), but matrix is [row][col]. So we plot (col, row).
+        for r, c in path:
+            canvas.restore_region(trail_so_far)
+            trail.set_data([c], [r])
+            ax.draw_artist(trail)
+            trail_so_far = canvas.copy_from_bbox(fig.bbox)
+            agent.set_data([c], [r])
+            ax.draw_artist(agent)
+            gif.grab()
+        gif.hold(pause_frames)
+        total_frames += len(path) + pause_frames
+
+    gif.close()
+    print(f"Rendered {total_frames} frames ({gif.frames} distinct).")
     print(f"Combined animation saved to '{filename}'")
-    plt.close()
+
+def create_exploration_animation(maze, algorithms_list, start=(0, 0), goal=None,
+                                 expansions_per_frame=None, filename="Images/Exploration.gif"):
+    """
+    Animates how each algorithm explores the maze (frontier, expanded cells,
+    final path), one algorithm after the other. Frames are drawn straight
+    from each solver's search event stream (see SearchEvents) into a single
+    n x n array, so memory stays flat however long the search runs.
+    Rendering is blitted: each frame redraws only the cell image and the
+    title over the saved axes background.
+    """
+    if goal is None:
+        goal = (maze.n - 1, maze.n - 1)
+    if expansions_per_frame is None:
+        # Roughly 100 frames for a search that expands the whole maze
+        expansions_per_frame = max(1, maze.n * maze.n // 100)
+    pause_frames = 15
+
+    # Cell codes: [Open, Wall, Frontier, Expanded, PathTrace]
+    cmap = mcolors.ListedColormap(['white', 'black', 'khaki', 'lightsteelblue', 'deepskyblue'])
+    norm = mcolors.BoundaryNorm([-0.5, 0.5, 1.5, 2.5, 3.5, 4.5], cmap.N)
+    background = maze.as_array().copy()
+    cells = background.copy()
+
+    fig = Figure(figsize=(7, 7))
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    # The cells and the title change every frame; everything else is drawn once
+    image = ax.imshow(cells, cmap=cmap, norm=norm, animated=True)
+    title_text = ax.text(0.5, 1.02, "", transform=ax.transAxes, ha="center", fontsize=14, fontweight='bold', color='darkblue', animated=True)
+    ax.axis('off')
+    canvas.draw()
+    clean = canvas.copy_from_bbox(fig.bbox)
+    gif = GifFrames(canvas, filename)
+
+    print(f"Rendering exploration to '{filename}'...")
+    for label, class_name, kwargs in algorithms_list:
+        solver_class = getattr(importlib.import_module(class_name), class_name)
+        solver = solver_class(maze, **kwargs)
+        cells[:] = background
+        expanded = 0
+
+        def draw(status):
+            canvas.restore_region(clean)
+            image.set_data(cells)
+            title_text.set_text(f"{label}: {status}")
+            ax.draw_artist(image)
+            ax.draw_artist(title_text)
+            gif.grab()
+
+        for kind, payload in search_events(solver, start, goal):
+            if kind == PUSH:
+                cells[payload] = 2
+            elif kind == EXPAND:
+                cells[payload] = 3
+                expanded += 1
+                if expanded % expansions_per_frame == 0:
+                    draw(f"{expanded} expanded")
+            elif kind == GOAL:
+                for cell in payload:
+                    cells[cell] = 4
+
+        draw(f"{expanded} expanded")
+        gif.hold(pause_frames)
+
+    gif.close()
+    print(f"Exploration animation saved to '{filename}'")
 
 def main():
     # 1. Setup Maze
@@ -184,31 +402,27 @@ def main():
     maze = Maze(maze_size, wall_prob=0.3)
     
     # 2. Define Algorithms to run (Order matters for the video!)
+    # (label, solver class, constructor kwargs) - solvers are built inside the worker processes
     algorithms_list = [
-        ("BFS", BFS(maze)),
-        ("DFS", DFS(maze)),
-        ("UCS", UCS(maze)),
-        ("A* (Manhattan)", AStarSearch(maze, heuristic_type="manhattan")),
-        ("IDS", IDS(maze)),
-        ("Greedy BFS", GreedyBFS(maze)),
-        ("Hill Climbing", HillClimbing(maze)),
-        ("Genetic Algo", GeneticAlgorithm(maze, population_size=100, generations=200)),
+        ("BFS", "BFS", {}),
+        ("DFS", "DFS", {}),
+        ("UCS", "UCS", {}),
+        ("A* (Manhattan)", "AStarSearch", {"heuristic_type": "manhattan"}),
+        ("JPS", "JPS", {}),
+        ("IDS", "IDS", {}),
+        ("Greedy BFS", "GreedyBFS", {}),
+        ("Hill Climbing", "HillClimbing", {}),
+        ("Genetic Algo", "GeneticAlgorithm", {"population_size": 100, "generations": 200}),
     ]
     
-    results = {}
-    algo_names_order = [] # To keep track of order for the video
+    algo_names_order = [name for name, _, _ in algorithms_list] # To keep track of order for the video
 
-    # 3. Run Solvers
+    # 3. Run Solvers in parallel (each one is timed inside its own worker process)
     start_node = (0, 0)
     goal_node = (maze.n - 1, maze.n - 1)
 
-    for name, solver in algorithms_list:
-        algo_names_order.append(name)
-        print(f"Running {name}...")
-        t0 = time.time()
-        path, nodes = solver.solve(start_node, goal_node)
-        t1 = time.time()
-        results[name] = (path, nodes, t1-t0)
+    print(f"Running {len(algorithms_list)} algorithms in parallel...")
+    results = run_parallel(maze, algorithms_list, start_node, goal_node)
 
     # 4. Generate Static Comparison Image
     plot_static_comparison(maze, results)
@@ -216,6 +430,13 @@ def main():
     # 5. Generate ONE Combined Animation
     create_combined_animation(maze, results, algo_names_order)
 
+    # 6. Animate how each algorithm explores the maze, straight from its search events
+    create_exploration_animation(maze, algorithms_list, start_node, goal_node)
+
+    # 7. Where each algorithm spends its expansions
+    heatmaps = expansion_heatmaps(maze, algorithms_list, start_node, goal_node)
+    plot_heatmap_comparison(maze, heatmaps)
+
 if __name__ == "__main__":
     if not os.path.exists("Images"):
         os.makedirs("Images")
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from BFS import BFS
+from BatchSolve import solve_many
+from Maze import Maze
+
+# A wall down column 2 splits the maze into a left and a right region
+CELLS = np.zeros((5, 5), dtype=np.uint8)
+CELLS[:, 2] = 1
+PAIRS = [((0, 0), (4, 1)),   # left to left
+         ((0, 0), (4, 4)),   # left to right: unreachable
+         ((0, 3), (4, 4)),   # right to right
+         ((4, 4), (4, 4))]   # start is the goal
+
+
+@pytest.fixture
+def mapped_maze(tmp_path):
+    Maze.from_array(CELLS).save(tmp_path / "split.maze")
+    return Maze.open(str(tmp_path / "split.maze"))
+
+
+def check_results(maze, results):
+    assert len(results) == len(PAIRS)
+    for (start, goal), (path, _) in zip(PAIRS, results):
+        expected, _ = BFS(maze).solve(start, goal)
+        assert len(path) == len(expected)
+        if path:
+            assert path[0] == start and path[-1] == goal
+    assert results[1][0] == []
+
+
+def test_unreachable_pair_on_mapped_maze(mapped_maze):
+    check_results(mapped_maze, solve_many(mapped_maze, PAIRS))
+
+
+@pytest.mark.parametrize("use_costs", [False, True])
+def test_unsettled_target_is_not_traced(mapped_maze, use_costs):
+    # Skip the component check, so the group searches themselves miss the target
+    mapped_maze.reachable = lambda a, b: True
+    results = solve_many(mapped_maze, PAIRS, use_costs)
+    check_results(mapped_maze, results)
+    assert results[1][1] > 0
@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+from AStarSearch import AStarSearch
+from BFS import BFS
+from DFS import DFS
+from GreedyBFS import GreedyBFS
+from HillClimbing import HillClimbing
+from IDS import IDS
+from JPS import JPS
+from Maze import Maze
+from SearchEvents import EXPAND, GOAL, search_events, streams
+from UCS import UCS
+
+SOLVERS = {
+    "BFS": BFS,
+    "DFS": DFS,
+    "UCS": UCS,
+    "AStarSearch": AStarSearch,
+    "AStarSearch-precompute": lambda maze: AStarSearch(maze, precompute=True),
+    "GreedyBFS": GreedyBFS,
+    "IDS": IDS,
+    "JPS": JPS,
+    "HillClimbing": HillClimbing,
+}
+
+VARIANTS = {
+    "BFS-vectorized": lambda maze: BFS(maze, mode="vectorized"),
+    "BFS-bidirectional": lambda maze: BFS(maze, mode="bidirectional"),
+    "BFS-graph": lambda maze: BFS(maze, mode="graph"),
+    "AStarSearch-bidirectional": lambda maze: AStarSearch(maze, bidirectional=True),
+    "AStarSearch-graph": lambda maze: AStarSearch(maze, graph=True),
+    "UCS-graph": lambda maze: UCS(maze, graph=True),
+    "IDS-reuse_depths": lambda maze: IDS(maze, reuse_depths=True),
+}
+
+
+def queries(seed, max_cost=1, count=6):
+    """Random small mazes with random (start, goal) pairs, walls and unreachable pairs included."""
+    rng = random.Random(seed)
+    for _ in range(count):
+        maze = Maze(rng.randint(1, 12), rng.choice([0.1, 0.3, 0.45]), seed=rng.randrange(10 ** 6),
+                    max_cost=max_cost)
+        n = maze.n
+        yield maze, (0, 0), (n - 1, n - 1)
+        yield maze, (rng.randrange(n), rng.randrange(n)), (rng.randrange(n), rng.randrange(n))
+
+
+@pytest.mark.parametrize("name", sorted(SOLVERS))
+@pytest.mark.parametrize("max_cost", [1, 4])
+@pytest.mark.parametrize("seed", range(4))
+def test_events_match_solve(name, max_cost, seed):
+    if name == "JPS" and max_cost > 1:
+        pytest.skip("JPS rejects weighted mazes")
+    for maze, start, goal in queries(seed, max_cost):
+        solver = SOLVERS[name](maze)
+        assert streams(solver)
+        path, nodes_explored = solver.solve(start, goal)
+
+        expansions = 0
+        goal_path = []
+        for kind, payload in solver.events(start, goal):
+            if kind == EXPAND:
+                expansions += 1
+            elif kind == GOAL:
+                goal_path = payload
+        assert expansions == nodes_explored
+        assert goal_path == path
+
+
+@pytest.mark.parametrize("name", sorted(VARIANTS))
+def test_variants_are_replayed_not_streamed(name):
+    for maze, start, goal in queries(0):
+        solver = VARIANTS[name](maze)
+        assert not streams(solver)
+        path, _ = solver.solve(start, goal)
+        replay = list(search_events(solver, start, goal))
+        assert [payload for kind, payload in replay if kind == EXPAND] == path